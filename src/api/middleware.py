@@ -16,7 +16,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         start_time = time.time()
         
         # Log de la requête entrante
-        logger.info(f"Requête entrante: {request.method} {request.url}")
+        logger.info("Requête entrante: %s %s", request.method, request.url)
         
         # Traitement de la requête
         response = await call_next(request)
@@ -71,7 +71,7 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             return response
             
         except Exception as exc:
-            logger.error(f"Erreur non gérée: {exc}", exc_info=True)
+            logger.error("Erreur non gérée: %s", exc, exc_info=True)
             
             # Retourner une réponse d'erreur standardisée
             from fastapi.responses import JSONResponse
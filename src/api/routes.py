@@ -131,7 +131,7 @@ async def health_check():
         }
         
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         return {
             "status": "unhealthy",
             "timestamp": datetime.now().isoformat(),
@@ -144,7 +144,7 @@ async def analyze_patient(request: PatientAnalysisRequest, background_tasks: Bac
     Analyse un patient et prédit son rétablissement
     """
     try:
-        logger.info(f"Analyse du patient pour pathologie: {request.pathologie}")
+        logger.info("Analyse du patient pour pathologie: %s", request.pathologie)
         
         # Conversion des données
         patient_data = {
@@ -163,12 +163,12 @@ async def analyze_patient(request: PatientAnalysisRequest, background_tasks: Bac
         else:
             save_analysis_to_db(patient_data, resultat)
         
-        logger.info(f"Analyse terminée pour patient: {resultat['patient_id']}")
+        logger.info("Analyse terminée pour patient: %s", resultat['patient_id'])
         
         return resultat
         
     except Exception as e:
-        logger.error(f"Erreur lors de l'analyse: {str(e)}")
+        logger.error("Erreur lors de l'analyse: %s", e)
         raise HTTPException(status_code=500, detail=f"Erreur d'analyse: {str(e)}")
 
 def save_analysis_to_db(patient_data: Dict, analysis_result: Dict):
@@ -177,7 +177,7 @@ def save_analysis_to_db(patient_data: Dict, analysis_result: Dict):
         patient_id = db_manager.save_patient(patient_data)
         db_manager.save_analysis(patient_id, analysis_result)
     except Exception as e:
-        logger.error(f"Erreur lors de la sauvegarde en base: {e}")
+        logger.error("Erreur lors de la sauvegarde en base: %s", e)
 
 @app.get("/api/medical/patient/{patient_id}")
 async def get_patient_analysis(patient_id: str):
@@ -210,7 +210,7 @@ async def get_patient_analysis(patient_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Erreur lors de la récupération: {str(e)}")
+        logger.error("Erreur lors de la récupération: %s", e)
         raise HTTPException(status_code=500, detail=f"Erreur de récupération: {str(e)}")
 
 @app.post("/api/medical/treatment/recommend")
@@ -231,15 +231,15 @@ async def recommend_treatments(request: PatientAnalysisRequest):
         
         return {
             "pathologie": request.pathologie,
-            "traitements_recommandes": traitements,
+            "traitements_recommandes": [t.to_dict() for t in traitements],
             "condition_analyse": {
-                "score_gravite": analyse_sante["score_gravite"],
-                "etat_sante": analyse_sante["etat_sante"].label
+                "score_gravite": analyse_sante.score_gravite,
+                "etat_sante": analyse_sante.etat_sante.label
             }
         }
         
     except Exception as e:
-        logger.error(f"Erreur lors de la recommandation: {str(e)}")
+        logger.error("Erreur lors de la recommandation: %s", e)
         raise HTTPException(status_code=500, detail=f"Erreur de recommandation: {str(e)}")
 
 @app.post("/api/medical/cohort/analyze")
@@ -262,7 +262,7 @@ async def analyze_cohort(request: CohortAnalysisRequest):
         return resultat
         
     except Exception as e:
-        logger.error(f"Erreur lors de l'analyse de cohorte: {str(e)}")
+        logger.error("Erreur lors de l'analyse de cohorte: %s", e)
         raise HTTPException(status_code=500, detail=f"Erreur d'analyse de cohorte: {str(e)}")
 
 @app.get("/api/system/status")
@@ -296,7 +296,7 @@ async def list_patients(limit: int = 50, offset: int = 0):
             "offset": offset
         }
     except Exception as e:
-        logger.error(f"Erreur lors de la liste des patients: {e}")
+        logger.error("Erreur lors de la liste des patients: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/follow-up")
@@ -316,7 +316,7 @@ async def add_follow_up(request: FollowUpRequest):
         return {"status": "success", "message": "Suivi ajouté avec succès"}
         
     except Exception as e:
-        logger.error(f"Erreur lors de l'ajout du suivi: {e}")
+        logger.error("Erreur lors de l'ajout du suivi: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/follow-up/{patient_id}")
@@ -332,7 +332,7 @@ async def get_patient_follow_ups(patient_id: str):
             "total_entries": len(follow_ups)
         }
     except Exception as e:
-        logger.error(f"Erreur lors de la récupération du suivi: {e}")
+        logger.error("Erreur lors de la récupération du suivi: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/statistics")
@@ -344,7 +344,7 @@ async def get_statistics():
         stats = db_manager.get_statistics()
         return stats
     except Exception as e:
-        logger.error(f"Erreur lors de la récupération des statistiques: {e}")
+        logger.error("Erreur lors de la récupération des statistiques: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/export/data")
@@ -362,13 +362,13 @@ async def export_data():
             media_type='application/json'
         )
     except Exception as e:
-        logger.error(f"Erreur lors de l'export: {e}")
+        logger.error("Erreur lors de l'export: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Gestion des erreurs
 @app.exception_handler(500)
 async def internal_server_error_handler(request, exc):
-    logger.error(f"Erreur interne du serveur: {exc}")
+    logger.error("Erreur interne du serveur: %s", exc)
     return JSONResponse(
         status_code=500,
         content={"detail": "Erreur interne du serveur"}
@@ -0,0 +1,43 @@
+"""
+Noyaux numériques des scores de condition (compilés avec Numba si disponible)
+"""
+
+from typing import Dict, Tuple
+import numpy as np
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    # Signature explicite : compilé (ou relu depuis le cache) dès l'import, hors latence des requêtes
+    @njit('UniTuple(float64, 2)(float64[::1])', cache=True)
+    def _moyennes_niveaux_kernel(base):
+        """Moyennes des niveaux supérieurs (sommes) et inférieurs (écarts) sans construire la pyramide"""
+        sommes = base.copy()
+        ecarts = base.copy()
+        total_sup = 0.0
+        total_inf = 0.0
+        compte = 0
+        for taille in range(base.size - 1, 0, -1):
+            for i in range(taille):
+                sommes[i] = sommes[i] + sommes[i + 1]
+                ecarts[i] = abs(ecarts[i] - ecarts[i + 1])
+                total_sup += sommes[i]
+                total_inf += ecarts[i]
+            compte += taille
+        return total_sup / compte, total_inf / compte
+
+def moyennes_niveaux(pyramide: Dict) -> Tuple[float, float]:
+    """Moyennes des valeurs des parties supérieure et inférieure d'une pyramide (base d'au moins 2 valeurs)"""
+    if _HAS_NUMBA:
+        return _moyennes_niveaux_kernel(np.asarray(pyramide['base'], dtype=np.float64))
+    
+    superieure = pyramide['superieure']
+    inferieure = pyramide['inferieure']
+    return (
+        sum(map(sum, superieure)) / sum(map(len, superieure)),
+        sum(map(sum, inferieure)) / sum(map(len, inferieure))
+    )
@@ -66,14 +66,15 @@ class AlgoVerite:
         }
         
         # Construction partie supérieure (additions)
-        current = sequence.copy()
+        current = sequence
         while len(current) > 1:
             next_level = [current[i] + current[i+1] for i in range(len(current)-1)]
-            pyramide['superieure'].insert(0, next_level)
+            pyramide['superieure'].append(next_level)
             current = next_level
+        pyramide['superieure'].reverse()
         
         # Construction partie inférieure (différences absolues)
-        current = sequence.copy()
+        current = sequence
         while len(current) > 1:
             next_level = [abs(current[i] - current[i+1]) for i in range(len(current)-1)]
             pyramide['inferieure'].append(next_level)
@@ -1,8 +1,72 @@
 import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
+from itertools import product
 import hashlib
+import json
+import time
+
+from src.core._kernels import moyennes_niveaux
+
+# Durée (en secondes) pendant laquelle une date ISO calculée est réutilisée
+_GRANULARITE_HORLOGE = 0.05
+_dates_iso_cache: Dict[int, str] = {}
+_dates_iso_instant = 0.0
+
+def _date_iso_dans(jours: int) -> str:
+    """Retourne la date courante décalée de `jours` jours au format ISO"""
+    global _dates_iso_instant
+    
+    # time.time() est moins coûteux que datetime.now() pour tester l'expiration
+    instant = time.time()
+    if instant - _dates_iso_instant >= _GRANULARITE_HORLOGE:
+        _dates_iso_cache.clear()
+        _dates_iso_instant = instant
+    
+    date_iso = _dates_iso_cache.get(jours)
+    if date_iso is None:
+        date_iso = (datetime.now() + timedelta(days=jours)).isoformat()
+        _dates_iso_cache[jours] = date_iso
+    return date_iso
+
+_ETATS_EVOLUTION = ("BON", "STABLE", "MODÉRÉ", "GRAVE", "CRITIQUE")
+
+def _composer_actions_jour(premier_jour: bool, etat: str, score_faible: bool, evaluation: bool) -> Tuple[str, ...]:
+    """Compose les actions recommandées pour une combinaison jour/état/score"""
+    actions = ["Surveillance des symptômes", "Hydratation adéquate"]
+    
+    if premier_jour:
+        actions.extend(["Début du traitement", "Repos strict"])
+    elif etat in ["CRITIQUE", "GRAVE"]:
+        actions.extend(["Surveillance médicale rapprochée", "Contrôle des paramètres vitaux"])
+    elif etat == "MODÉRÉ":
+        actions.extend(["Repos relatif", "Adaptation des activités"])
+    elif score_faible:
+        actions.extend(["Reprise progressive des activités", "Réadaptation"])
+    
+    if evaluation:  # Tous les 3 jours
+        actions.append("Évaluation de l'évolution")
+    
+    return tuple(actions)
+
+def _copie_profonde(valeur: Any) -> Any:
+    """Copie récursive des dict, listes et tuples (comme dataclasses.asdict), valeurs immuables partagées"""
+    if isinstance(valeur, dict):
+        return {cle: _copie_profonde(v) for cle, v in valeur.items()}
+    if isinstance(valeur, list):
+        return [_copie_profonde(v) for v in valeur]
+    if isinstance(valeur, tuple):
+        return tuple(_copie_profonde(v) for v in valeur)
+    return valeur
+
+# Actions indexées par (jour 0, état, score < 0.3, jour multiple de 3)
+_ACTIONS_JOUR: Dict[Tuple[bool, str, bool, bool], Tuple[str, ...]] = {
+    cle: _composer_actions_jour(*cle)
+    for cle in product((True, False), _ETATS_EVOLUTION, (True, False), (True, False))
+}
 
 class EtatSante(Enum):
     CRITIQUE = (0.1, "CRITIQUE")
@@ -15,15 +79,172 @@ class EtatSante(Enum):
         self.score = score
         self.label = label
 
+@dataclass
+class Evolution:
+    """Évolution prédite jour par jour, stockée par colonnes"""
+    __slots__ = ('jours', 'scores', 'etats', 'actions')
+    
+    jours: np.ndarray
+    scores: np.ndarray
+    etats: np.ndarray
+    actions: List[Tuple[str, ...]]
+    
+    def __len__(self) -> int:
+        return len(self.jours)
+    
+    @classmethod
+    def vide(cls) -> 'Evolution':
+        """Retourne une évolution sans aucun jour"""
+        return cls(
+            jours=np.empty(0, dtype=np.int64),
+            scores=np.empty(0, dtype=np.float64),
+            etats=np.empty(0, dtype='<U8'),
+            actions=[]
+        )
+    
+    def as_list_of_dicts(self) -> List[Dict]:
+        """Convertit l'évolution au format historique (une entrée par jour)"""
+        return [
+            {
+                'jour': int(jour),
+                'score_gravite': float(score),
+                'etat': str(etat),
+                'actions_recommandees': list(actions)
+            }
+            for jour, score, etat, actions in zip(self.jours, self.scores, self.etats, self.actions)
+        ]
+
+@dataclass(frozen=True)
+class AnalyseSante:
+    """Analyse de la condition médicale du patient"""
+    __slots__ = (
+        'pyramide_sante', 'score_gravite', 'potentiel_retablissement', 'resilience_patient',
+        'harmonie_biologique', 'etat_sante', 'facteurs_aggravants', 'indicateurs_favorables'
+    )
+    
+    pyramide_sante: Dict
+    score_gravite: float
+    potentiel_retablissement: float
+    resilience_patient: float
+    harmonie_biologique: float
+    etat_sante: EtatSante
+    facteurs_aggravants: List[str]
+    indicateurs_favorables: List[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pyramide_sante': _copie_profonde(self.pyramide_sante),
+            'score_gravite': self.score_gravite,
+            'potentiel_retablissement': self.potentiel_retablissement,
+            'resilience_patient': self.resilience_patient,
+            'harmonie_biologique': self.harmonie_biologique,
+            'etat_sante': self.etat_sante,
+            'facteurs_aggravants': list(self.facteurs_aggravants),
+            'indicateurs_favorables': list(self.indicateurs_favorables)
+        }
+
+@dataclass(frozen=True)
+class TraitementRecommande:
+    """Traitement candidat évalué pour un patient"""
+    __slots__ = (
+        'nom', 'protocole', 'efficacite_base', 'compatibilite_personnalisee',
+        'score_global', 'delai_action_attendu', 'indications'
+    )
+    
+    nom: str
+    protocole: str
+    efficacite_base: float
+    compatibilite_personnalisee: float
+    score_global: float
+    delai_action_attendu: int
+    indications: List[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'nom': self.nom,
+            'protocole': self.protocole,
+            'efficacite_base': self.efficacite_base,
+            'compatibilite_personnalisee': self.compatibilite_personnalisee,
+            'score_global': self.score_global,
+            'delai_action_attendu': self.delai_action_attendu,
+            'indications': list(self.indications)
+        }
+
+@dataclass(frozen=True)
+class PredictionRetablissement:
+    """Prédiction de rétablissement du patient"""
+    __slots__ = (
+        'duree_maladie_predite', 'date_retablissement_predite', 'probabilite_succes',
+        'niveau_confiance', 'facteurs_favorables', 'risques_identifies',
+        'evolution_predite', 'recommandations_specifiques'
+    )
+    
+    duree_maladie_predite: int
+    date_retablissement_predite: str
+    probabilite_succes: float
+    niveau_confiance: float
+    facteurs_favorables: List[str]
+    risques_identifies: List[str]
+    evolution_predite: Evolution
+    recommandations_specifiques: List[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'duree_maladie_predite': self.duree_maladie_predite,
+            'date_retablissement_predite': self.date_retablissement_predite,
+            'probabilite_succes': self.probabilite_succes,
+            'niveau_confiance': self.niveau_confiance,
+            'facteurs_favorables': list(self.facteurs_favorables),
+            'risques_identifies': list(self.risques_identifies),
+            'evolution_predite': self.evolution_predite.as_list_of_dicts(),
+            'recommandations_specifiques': list(self.recommandations_specifiques)
+        }
+
+@dataclass(frozen=True)
+class PlanSoins:
+    """Plan de soins personnalisé"""
+    __slots__ = (
+        'traitement_principal', 'protocole_applique', 'duree_traitement_recommandee',
+        'posologie_recommandee', 'suivi_recommande', 'criteres_amelioration',
+        'actions_immediates', 'contingence', 'recommandations_complementaires'
+    )
+    
+    traitement_principal: str
+    protocole_applique: str
+    duree_traitement_recommandee: int
+    posologie_recommandee: str
+    suivi_recommande: List[Dict]
+    criteres_amelioration: List[str]
+    actions_immediates: List[str]
+    contingence: Dict
+    recommandations_complementaires: List[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'traitement_principal': self.traitement_principal,
+            'protocole_applique': self.protocole_applique,
+            'duree_traitement_recommandee': self.duree_traitement_recommandee,
+            'posologie_recommandee': self.posologie_recommandee,
+            'suivi_recommande': _copie_profonde(self.suivi_recommande),
+            'criteres_amelioration': list(self.criteres_amelioration),
+            'actions_immediates': list(self.actions_immediates),
+            'contingence': _copie_profonde(self.contingence),
+            'recommandations_complementaires': list(self.recommandations_complementaires)
+        }
+
 class AlgoVeriteMedical:
     """
     Système de recherche sanitaire et prédiction de rétablissement
     basé sur l'analyse pyramidale et l'harmonie biomathématique
     """
     
+    # Nombre de préparations (condition + traitements) conservées, par ordre d'utilisation
+    PREPARATION_CACHE_SIZE = 1024
+    
     def __init__(self):
         self.base_connaissances_medicales = self._initialiser_base_medicale()
         self.historique_patients = {}
+        self.preparations_cache = {}
         self.protocoles_traitements = self._initialiser_protocoles()
         self.modeles_prediction = self._initialiser_modeles_prediction()
         
@@ -181,17 +402,46 @@ class AlgoVeriteMedical:
         """
         Analyse complète d'un patient et prédiction de son rétablissement
         """
-        # Validation des données
-        self._valider_donnees_patient(patient_data)
-        
-        # Analyse pyramidale de la condition du patient
-        analyse_sante = self._analyser_condition_patient(patient_data)
-        
-        # Recherche de traitement optimal
-        traitements_recommandes = self._rechercher_traitements_optimaux(patient_data, analyse_sante)
+        # Validation, analyse pyramidale de la condition et recherche de traitement optimal
+        analyse_sante, traitements_recommandes = self._preparer_analyse(patient_data)
         
+        return self._finaliser_analyse(patient_data, analyse_sante, traitements_recommandes)
+    
+    def _preparer_analyse(self, patient_data: Dict) -> Tuple[AnalyseSante, List[TraitementRecommande]]:
+        """
+        Valide le patient, analyse sa condition et recherche ses traitements.
+        Ces étapes ne dépendent que du contenu du patient : elles sont mémorisées
+        (cache LRU) par empreinte canonique, contrairement à la prédiction datée.
+        """
+        cle = self._empreinte_patient(patient_data)
+        preparation = self.preparations_cache.pop(cle, None) if cle is not None else None
+        
+        if preparation is None:
+            self._valider_donnees_patient(patient_data)
+            analyse_sante = self._analyser_condition_patient(patient_data)
+            preparation = (analyse_sante, self._rechercher_traitements_optimaux(patient_data, analyse_sante))
+            if cle is None:
+                return preparation
+            if len(self.preparations_cache) >= self.PREPARATION_CACHE_SIZE:
+                del self.preparations_cache[next(iter(self.preparations_cache))]
+        
+        self.preparations_cache[cle] = preparation
+        return preparation
+    
+    @staticmethod
+    def _empreinte_patient(patient_data: Dict) -> Optional[bytes]:
+        """Empreinte SHA-256 du JSON canonique du patient (None si non sérialisable)"""
+        try:
+            return hashlib.sha256(json.dumps(patient_data, sort_keys=True).encode()).digest()
+        except (TypeError, ValueError):
+            return None
+    
+    def _finaliser_analyse(self, patient_data: Dict, analyse_sante: AnalyseSante,
+                           traitements_recommandes: List[TraitementRecommande],
+                           evolution: Optional[Evolution] = None) -> Dict:
+        """Prédit le rétablissement, génère le plan de soins et archive le résultat"""
         # Prédiction de rétablissement
-        prediction = self._predire_retablissement(patient_data, analyse_sante, traitements_recommandes)
+        prediction = self._predire_retablissement(patient_data, analyse_sante, traitements_recommandes, evolution)
         
         # Génération du plan de soins
         plan_soins = self._generer_plan_soins(prediction, traitements_recommandes, patient_data)
@@ -201,11 +451,11 @@ class AlgoVeriteMedical:
         
         resultat = {
             'patient_id': patient_data.get('id', self._generer_id_patient(patient_data)),
-            'timestamp_analyse': datetime.now().isoformat(),
-            'condition_actuelle': analyse_sante,
-            'traitements_recommandes': traitements_recommandes,
-            'prediction_retablissement': prediction,
-            'plan_soins_personnalise': plan_soins,
+            'timestamp_analyse': _date_iso_dans(0),
+            'condition_actuelle': analyse_sante.to_dict(),
+            'traitements_recommandes': [t.to_dict() for t in traitements_recommandes],
+            'prediction_retablissement': prediction.to_dict(),
+            'plan_soins_personnalise': plan_soins.to_dict(),
             'facteurs_pronostiques': self._identifier_facteurs_pronostiques(analyse_sante, patient_data),
             'recommandations_suivi': self._generer_recommandations_suivi(prediction, patient_data),
             'score_confiance_global': score_confiance,
@@ -232,7 +482,7 @@ class AlgoVeriteMedical:
         data_string = f"{patient_data.get('pathologie', '')}{patient_data.get('profil', {})}"
         return f"PAT_{hashlib.sha256(data_string.encode()).hexdigest()[:8]}"
     
-    def _analyser_condition_patient(self, patient_data: Dict) -> Dict:
+    def _analyser_condition_patient(self, patient_data: Dict) -> AnalyseSante:
         """Analyse la condition médicale du patient via l'algorithme pyramidal"""
         
         # Conversion des données en séquences numériques
@@ -243,16 +493,16 @@ class AlgoVeriteMedical:
         # Construction de la pyramide de santé
         pyramide_sante = self._construire_pyramide_sante(symptomes_codes, pathologie_codes, profil_codes)
         
-        return {
-            'pyramide_sante': pyramide_sante,
-            'score_gravite': self._calculer_gravite(symptomes_codes, pathologie_codes, patient_data),
-            'potentiel_retablissement': self._evaluer_potentiel_retablissement(pyramide_sante),
-            'resilience_patient': self._calculer_resilience(profil_codes, pyramide_sante, patient_data),
-            'harmonie_biologique': self._evaluer_harmonie_biologique(pyramide_sante),
-            'etat_sante': self._determiner_etat_sante(pyramide_sante, patient_data),
-            'facteurs_aggravants': self._identifier_facteurs_aggravants(patient_data),
-            'indicateurs_favorables': self._identifier_indicateurs_favorables(pyramide_sante)
-        }
+        return AnalyseSante(
+            pyramide_sante=pyramide_sante,
+            score_gravite=self._calculer_gravite(symptomes_codes, pathologie_codes, patient_data),
+            potentiel_retablissement=self._evaluer_potentiel_retablissement(pyramide_sante),
+            resilience_patient=self._calculer_resilience(profil_codes, pyramide_sante, patient_data),
+            harmonie_biologique=self._evaluer_harmonie_biologique(pyramide_sante),
+            etat_sante=self._determiner_etat_sante(pyramide_sante, patient_data),
+            facteurs_aggravants=self._identifier_facteurs_aggravants(patient_data),
+            indicateurs_favorables=self._identifier_indicateurs_favorables(pyramide_sante)
+        )
     
     def _coder_symptomes(self, symptomes: List[str]) -> List[int]:
         """Code les symptômes en séquence numérique"""
@@ -333,14 +583,15 @@ class AlgoVeriteMedical:
         }
         
         # Construction partie supérieure (indicateurs d'amélioration)
-        current = base.copy()
+        current = base
         while len(current) > 1:
             next_level = [current[i] + current[i+1] for i in range(len(current)-1)]
-            pyramide['superieure'].insert(0, next_level)
+            pyramide['superieure'].append(next_level)
             current = next_level
+        pyramide['superieure'].reverse()
         
         # Construction partie inférieure (indicateurs de risque)
-        current = base.copy()
+        current = base
         while len(current) > 1:
             next_level = [abs(current[i] - current[i+1]) for i in range(len(current)-1)]
             pyramide['inferieure'].append(next_level)
@@ -406,15 +657,8 @@ class AlgoVeriteMedical:
         if not pyramide['superieure'] or not pyramide['inferieure']:
             return 0.5
         
-        # Équilibre entre les systèmes
-        valeurs_sup = [item for niveau in pyramide['superieure'] for item in niveau]
-        valeurs_inf = [item for niveau in pyramide['inferieure'] for item in niveau]
-        
-        if not valeurs_sup or not valeurs_inf:
-            return 0.5
-        
-        moyenne_sup = np.mean(valeurs_sup)
-        moyenne_inf = np.mean(valeurs_inf)
+        # Équilibre entre les systèmes (niveaux non vides dès que la base a deux valeurs)
+        moyenne_sup, moyenne_inf = moyennes_niveaux(pyramide)
         
         if moyenne_sup == 0 or moyenne_inf == 0:
             return 0.5
@@ -487,8 +731,13 @@ class AlgoVeriteMedical:
         
         return indicateurs
     
-    def _rechercher_traitements_optimaux(self, patient_data: Dict, analyse_sante: Dict) -> List[Dict]:
-        """Recherche les traitements optimaux pour le patient"""
+    def _rechercher_traitements_optimaux(self, patient_data: Dict, analyse_sante: AnalyseSante) -> List[TraitementRecommande]:
+        """
+        Recherche les traitements optimaux pour le patient
+        
+        La liste retournée est triée par score global décroissant : le
+        meilleur traitement est toujours traitements[0].
+        """
         pathologie = patient_data.get('pathologie', '').upper()
         profil = patient_data.get('profil', {})
         symptomes = patient_data.get('symptomes', [])
@@ -506,7 +755,7 @@ class AlgoVeriteMedical:
                     
                     # Calcul du score de compatibilité personnalisé
                     score_compatibilite = self._calculer_compatibilite_traitement(
-                        traitement_ref, profil, analyse_sante, symptomes
+                        dict(traitement_ref, nom=traitement_nom), profil, analyse_sante, symptomes
                     )
                     
                     # Score global pondéré
@@ -516,22 +765,22 @@ class AlgoVeriteMedical:
                         (1 - traitement_ref['delai_action'] / 10) * 0.2  # Préférer les traitements rapides
                     )
                     
-                    traitements_candidats.append({
-                        'nom': traitement_nom,
-                        'protocole': protocole_nom,
-                        'efficacite_base': traitement_ref['efficacite'],
-                        'compatibilite_personnalisee': score_compatibilite,
-                        'score_global': score_global,
-                        'delai_action_attendu': traitement_ref['delai_action'],
-                        'indications': self._generer_indications_traitement(traitement_nom, symptomes)
-                    })
+                    traitements_candidats.append(TraitementRecommande(
+                        nom=traitement_nom,
+                        protocole=protocole_nom,
+                        efficacite_base=traitement_ref['efficacite'],
+                        compatibilite_personnalisee=score_compatibilite,
+                        score_global=score_global,
+                        delai_action_attendu=traitement_ref['delai_action'],
+                        indications=self._generer_indications_traitement(traitement_nom, symptomes)
+                    ))
         
         # Tri par score global décroissant
-        traitements_candidats.sort(key=lambda x: x['score_global'], reverse=True)
+        traitements_candidats.sort(key=lambda x: x.score_global, reverse=True)
         
         return traitements_candidats[:3]  # Retourne les 3 meilleurs traitements
     
-    def _calculer_compatibilite_traitement(self, traitement: Dict, profil: Dict, analyse_sante: Dict, symptomes: List[str]) -> float:
+    def _calculer_compatibilite_traitement(self, traitement: Dict, profil: Dict, analyse_sante: AnalyseSante, symptomes: List[str]) -> float:
         """Calcule la compatibilité personnalisée du traitement"""
         age_group = self._determiner_groupe_age(profil.get('age', 40))
         profil_ref = self.base_connaissances_medicales['profils_patients'].get(
@@ -546,10 +795,10 @@ class AlgoVeriteMedical:
         facteurs.append(profil_ref['reponse_traitement'])
         
         # Harmonnie avec l'état du patient
-        facteurs.append(analyse_sante['harmonie_biologique'])
+        facteurs.append(analyse_sante.harmonie_biologique)
         
         # Compatibilité avec la résilience
-        resilience_ratio = min(analyse_sante['resilience_patient'] / traitement.get('compatibilite', 0.5), 1)
+        resilience_ratio = min(analyse_sante.resilience_patient / traitement.get('compatibilite', 0.5), 1)
         facteurs.append(resilience_ratio)
         
         # Adéquation avec les symptômes
@@ -590,8 +839,15 @@ class AlgoVeriteMedical:
         
         return indications.get(traitement, ["Traitement symptomatique"])
     
-    def _predire_retablissement(self, patient_data: Dict, analyse_sante: Dict, traitements: List[Dict]) -> Dict:
-        """Prédit le rétablissement du patient"""
+    def _predire_retablissement(self, patient_data: Dict, analyse_sante: AnalyseSante,
+                                traitements: List[TraitementRecommande],
+                                evolution_predite: Optional[Evolution] = None) -> PredictionRetablissement:
+        """
+        Prédit le rétablissement du patient
+        
+        Une évolution déjà calculée (analyse de cohorte) peut être fournie ;
+        elle couvre alors les jours 0 à la durée prédite.
+        """
         
         if not traitements:
             return self._prediction_defaut(patient_data)
@@ -599,13 +855,10 @@ class AlgoVeriteMedical:
         meilleur_traitement = traitements[0]
         
         # Calcul de la durée prédite
-        duree_predite = self._predire_duree_maladie(
-            patient_data.get('pathologie', ''),
-            analyse_sante['score_gravite'],
-            analyse_sante['resilience_patient'],
-            meilleur_traitement['score_global'],
-            patient_data.get('profil', {})
-        )
+        if evolution_predite is None:
+            duree_predite = self._predire_duree_patient(patient_data, analyse_sante, traitements)
+        else:
+            duree_predite = len(evolution_predite) - 1
         
         # Calcul de la probabilité de succès
         probabilite_succes = self._calculer_probabilite_succes(
@@ -615,21 +868,33 @@ class AlgoVeriteMedical:
         )
         
         # Date de rétablissement prédite
-        date_predite = datetime.now() + timedelta(days=duree_predite)
+        date_predite = _date_iso_dans(duree_predite)
         
         # Évolution prédite
-        evolution_predite = self._predire_evolution(analyse_sante, duree_predite)
-        
-        return {
-            'duree_maladie_predite': duree_predite,
-            'date_retablissement_predite': date_predite.isoformat(),
-            'probabilite_succes': probabilite_succes,
-            'niveau_confiance': self._calculer_confiance_prediction(analyse_sante, traitements),
-            'facteurs_favorables': self._identifier_facteurs_favorables(analyse_sante),
-            'risques_identifies': self._identifier_risques(analyse_sante, patient_data.get('profil', {})),
-            'evolution_predite': evolution_predite,
-            'recommandations_specifiques': self._generer_recommandations_specifiques(analyse_sante, probabilite_succes)
-        }
+        if evolution_predite is None:
+            evolution_predite = self._predire_evolution(analyse_sante, duree_predite)
+        
+        return PredictionRetablissement(
+            duree_maladie_predite=duree_predite,
+            date_retablissement_predite=date_predite,
+            probabilite_succes=probabilite_succes,
+            niveau_confiance=self._calculer_confiance_prediction(analyse_sante, traitements),
+            facteurs_favorables=self._identifier_facteurs_favorables(analyse_sante),
+            risques_identifies=self._identifier_risques(analyse_sante, patient_data.get('profil', {})),
+            evolution_predite=evolution_predite,
+            recommandations_specifiques=self._generer_recommandations_specifiques(analyse_sante, probabilite_succes)
+        )
+    
+    def _predire_duree_patient(self, patient_data: Dict, analyse_sante: AnalyseSante,
+                               traitements: List[TraitementRecommande]) -> int:
+        """Prédit la durée de la maladie avec le meilleur traitement"""
+        return self._predire_duree_maladie(
+            patient_data.get('pathologie', ''),
+            analyse_sante.score_gravite,
+            analyse_sante.resilience_patient,
+            traitements[0].score_global,
+            patient_data.get('profil', {})
+        )
     
     def _predire_duree_maladie(self, pathologie: str, gravite: float, resilience: float, efficacite_traitement: float, profil: Dict) -> int:
         """Prédit la durée de la maladie"""
@@ -658,21 +923,21 @@ class AlgoVeriteMedical:
         
         return max(1, int(duree_ajustee))
     
-    def _calculer_probabilite_succes(self, analyse_sante: Dict, traitement: Dict, profil: Dict) -> float:
+    def _calculer_probabilite_succes(self, analyse_sante: AnalyseSante, traitement: TraitementRecommande, profil: Dict) -> float:
         """Calcule la probabilité de succès du traitement"""
         facteurs = []
         
         # Potentiel de rétablissement naturel
-        facteurs.append(analyse_sante['potentiel_retablissement'])
+        facteurs.append(analyse_sante.potentiel_retablissement)
         
         # Efficacité du traitement
-        facteurs.append(traitement['score_global'])
+        facteurs.append(traitement.score_global)
         
         # Résilience du patient
-        facteurs.append(analyse_sante['resilience_patient'])
+        facteurs.append(analyse_sante.resilience_patient)
         
         # Harmonnie biologique
-        facteurs.append(analyse_sante['harmonie_biologique'])
+        facteurs.append(analyse_sante.harmonie_biologique)
         
         # Facteur profil
         age_group = self._determiner_groupe_age(profil.get('age', 40))
@@ -685,9 +950,9 @@ class AlgoVeriteMedical:
         probabilite = sum(facteurs) / len(facteurs)
         
         # Ajustements contextuels
-        if analyse_sante['score_gravite'] > 0.8:
+        if analyse_sante.score_gravite > 0.8:
             probabilite *= 0.8  # Réduction pour cas graves
-        elif analyse_sante['score_gravite'] < 0.3:
+        elif analyse_sante.score_gravite < 0.3:
             probabilite *= 1.1  # Augmentation pour cas légers
         
         if profil.get('comorbidities', 0) >= 2:
@@ -695,25 +960,21 @@ class AlgoVeriteMedical:
         
         return min(max(probabilite, 0), 1)
     
-    def _calculer_confiance_prediction(self, analyse_sante: Dict, traitements: List[Dict]) -> float:
+    def _calculer_confiance_prediction(self, analyse_sante: AnalyseSante, traitements: List[TraitementRecommande]) -> float:
         """Calcule le niveau de confiance de la prédiction"""
         facteurs = []
         
         # Stabilité de l'analyse
-        facteurs.append(analyse_sante['harmonie_biologique'])
+        facteurs.append(analyse_sante.harmonie_biologique)
         
-        # Qualité des traitements disponibles
-        if traitements:
-            meilleur_score = max(t['score_global'] for t in traitements)
-            facteurs.append(meilleur_score)
-        else:
-            facteurs.append(0.3)
+        # Qualité des traitements disponibles (liste triée, le meilleur en tête)
+        facteurs.append(traitements[0].score_global if traitements else 0.3)
         
         # Cohérence des données
-        facteurs.append(1.0 - analyse_sante['score_gravite'] * 0.3)
+        facteurs.append(1.0 - analyse_sante.score_gravite * 0.3)
         
         # Stabilité structurelle
-        facteurs.append(1.0 if self._evaluer_stabilite_structurelle(analyse_sante['pyramide_sante']) else 0.7)
+        facteurs.append(1.0 if self._evaluer_stabilite_structurelle(analyse_sante.pyramide_sante) else 0.7)
         
         return sum(facteurs) / len(facteurs)
     
@@ -726,30 +987,53 @@ class AlgoVeriteMedical:
         # Considérer stable si peu de variations dans la base finale
         return len(set(base_finale)) <= 2
     
-    def _predire_evolution(self, analyse_sante: Dict, duree: int) -> List[Dict]:
+    def _predire_evolution(self, analyse_sante: AnalyseSante, duree: int) -> Evolution:
         """Prédit l'évolution jour par jour"""
-        evolution = []
-        score_initial = analyse_sante['score_gravite']
-        resilience = analyse_sante['resilience_patient']
-        
-        for jour in range(duree + 1):  # +1 pour inclure le jour 0
-            if jour == 0:
-                score = score_initial
-            else:
-                # Modèle d'amélioration exponentielle
-                amelioration_jour = resilience * 0.15
-                score = max(0, score_initial * (0.9 ** jour) - (amelioration_jour * jour))
-            
-            etat = self._determiner_etat_from_score(score)
-            
-            evolution.append({
-                'jour': jour,
-                'score_gravite': max(0, min(score, 1)),
-                'etat': etat,
-                'actions_recommandees': self._generer_actions_jour(jour, etat, score)
-            })
-        
-        return evolution
+        scores = self._predire_evolution_batch(
+            np.array([analyse_sante.score_gravite]),
+            np.array([analyse_sante.resilience_patient]),
+            np.array([duree])
+        )
+        return self._construire_evolution(scores[0], self._determiner_etats_from_scores(scores[0]))
+    
+    def _predire_evolution_batch(self, scores_init: np.ndarray, resiliences: np.ndarray, durees: np.ndarray) -> np.ndarray:
+        """
+        Prédit l'évolution de plusieurs patients en une seule opération
+        
+        Retourne une matrice (N, max(durees) + 1) de scores de gravité ; les
+        jours au-delà de la durée de chaque patient valent NaN.
+        """
+        jours = np.arange(durees.max() + 1)
+        
+        # Modèle d'amélioration exponentielle
+        amelioration_jour = resiliences[:, None] * 0.15
+        scores = np.maximum(0, scores_init[:, None] * (0.9 ** jours[None, :]) - (amelioration_jour * jours[None, :]))
+        scores[:, 0] = scores_init
+        
+        return np.where(jours[None, :] <= durees[:, None], scores, np.nan)
+    
+    def _construire_evolution(self, scores: np.ndarray, etats: np.ndarray) -> Evolution:
+        """Construit l'évolution d'un patient à partir de ses scores journaliers"""
+        scores = scores[~np.isnan(scores)]
+        etats = etats[:len(scores)]
+        jours = np.arange(len(scores))
+        actions = [
+            self._generer_actions_jour(int(jour), str(etat), float(score))
+            for jour, etat, score in zip(jours, etats, scores)
+        ]
+        
+        return Evolution(
+            jours=jours,
+            scores=np.clip(scores, 0, 1),
+            etats=etats,
+            actions=actions
+        )
+    
+    def _determiner_etats_from_scores(self, scores: np.ndarray) -> np.ndarray:
+        """Détermine l'état de santé pour chaque score d'un vecteur"""
+        seuils = np.array([0.2, 0.4, 0.6, 0.8])
+        etats = np.array(_ETATS_EVOLUTION)
+        return etats[np.searchsorted(seuils, scores, side='right')]
     
     def _determiner_etat_from_score(self, score: float) -> str:
         """Détermine l'état de santé à partir d'un score"""
@@ -764,53 +1048,39 @@ class AlgoVeriteMedical:
         else:
             return "BON"
     
-    def _generer_actions_jour(self, jour: int, etat: str, score: float) -> List[str]:
-        """Génère les actions recommandées pour un jour donné"""
-        actions_base = ["Surveillance des symptômes", "Hydratation adéquate"]
-        
-        if jour == 0:
-            actions_base.extend(["Début du traitement", "Repos strict"])
-        elif etat in ["CRITIQUE", "GRAVE"]:
-            actions_base.extend(["Surveillance médicale rapprochée", "Contrôle des paramètres vitaux"])
-        elif etat == "MODÉRÉ":
-            actions_base.extend(["Repos relatif", "Adaptation des activités"])
-        elif score < 0.3:
-            actions_base.extend(["Reprise progressive des activités", "Réadaptation"])
-        
-        if jour % 3 == 0:  # Tous les 3 jours
-            actions_base.append("Évaluation de l'évolution")
-        
-        return actions_base
+    def _generer_actions_jour(self, jour: int, etat: str, score: float) -> Tuple[str, ...]:
+        """Retourne les actions recommandées pour un jour donné (tuple partagé, non modifiable)"""
+        return _ACTIONS_JOUR[(jour == 0, etat, score < 0.3, jour % 3 == 0)]
     
-    def _prediction_defaut(self, patient_data: Dict) -> Dict:
+    def _prediction_defaut(self, patient_data: Dict) -> PredictionRetablissement:
         """Retourne une prédiction par défaut en cas de données insuffisantes"""
-        date_predite = datetime.now() + timedelta(days=14)
-        
-        return {
-            'duree_maladie_predite': 14,
-            'date_retablissement_predite': date_predite.isoformat(),
-            'probabilite_succes': 0.5,
-            'niveau_confiance': 0.3,
-            'facteurs_favorables': ['Données insuffisantes pour une analyse précise'],
-            'risques_identifies': ['Traitement non spécifique recommandé'],
-            'evolution_predite': [],
-            'recommandations_specifiques': ['Consultation médicale recommandée pour affiner le diagnostic']
-        }
+        date_predite = _date_iso_dans(14)
+        
+        return PredictionRetablissement(
+            duree_maladie_predite=14,
+            date_retablissement_predite=date_predite,
+            probabilite_succes=0.5,
+            niveau_confiance=0.3,
+            facteurs_favorables=['Données insuffisantes pour une analyse précise'],
+            risques_identifies=['Traitement non spécifique recommandé'],
+            evolution_predite=Evolution.vide(),
+            recommandations_specifiques=['Consultation médicale recommandée pour affiner le diagnostic']
+        )
     
-    def _identifier_facteurs_favorables(self, analyse_sante: Dict) -> List[str]:
+    def _identifier_facteurs_favorables(self, analyse_sante: AnalyseSante) -> List[str]:
         """Identifie les facteurs favorables au rétablissement"""
         facteurs = []
         
-        if analyse_sante['resilience_patient'] > 0.7:
+        if analyse_sante.resilience_patient > 0.7:
             facteurs.append("Forte résilience du patient")
         
-        if analyse_sante['harmonie_biologique'] > 0.8:
+        if analyse_sante.harmonie_biologique > 0.8:
             facteurs.append("Harmonie biologique élevée")
         
-        if analyse_sante['potentiel_retablissement'] > 0.7:
+        if analyse_sante.potentiel_retablissement > 0.7:
             facteurs.append("Potentiel de rétablissement élevé")
         
-        if analyse_sante['score_gravite'] < 0.4:
+        if analyse_sante.score_gravite < 0.4:
             facteurs.append("Gravité modérée de la condition")
         
         if not facteurs:
@@ -818,17 +1088,17 @@ class AlgoVeriteMedical:
         
         return facteurs
     
-    def _identifier_risques(self, analyse_sante: Dict, profil: Dict) -> List[str]:
+    def _identifier_risques(self, analyse_sante: AnalyseSante, profil: Dict) -> List[str]:
         """Identifie les risques potentiels"""
         risques = []
         
-        if analyse_sante['score_gravite'] > 0.7:
+        if analyse_sante.score_gravite > 0.7:
             risques.append("Condition médicale sévère")
         
-        if analyse_sante['resilience_patient'] < 0.4:
+        if analyse_sante.resilience_patient < 0.4:
             risques.append("Faible résilience du patient")
         
-        if analyse_sante['harmonie_biologique'] < 0.5:
+        if analyse_sante.harmonie_biologique < 0.5:
             risques.append("Déséquilibre biologique détecté")
         
         if profil.get('comorbidities', 0) > 2:
@@ -842,62 +1112,89 @@ class AlgoVeriteMedical:
         
         return risques
     
-    def _generer_recommandations_specifiques(self, analyse_sante: Dict, probabilite_succes: float) -> List[str]:
+    def _generer_recommandations_specifiques(self, analyse_sante: AnalyseSante, probabilite_succes: float) -> List[str]:
         """Génère des recommandations spécifiques basées sur l'analyse"""
         recommandations = []
         
-        if analyse_sante['resilience_patient'] < 0.5:
+        if analyse_sante.resilience_patient < 0.5:
             recommandations.append("Renforcement du système immunitaire recommandé")
         
-        if analyse_sante['harmonie_biologique'] < 0.6:
+        if analyse_sante.harmonie_biologique < 0.6:
             recommandations.append("Approche holistique pour rétablir l'équilibre biologique")
         
         if probabilite_succes < 0.6:
             recommandations.append("Plan de contingence à prévoir")
             recommandations.append("Surveillance renforcée nécessaire")
         
-        if analyse_sante['etat_sante'] in [EtatSante.CRITIQUE, EtatSante.GRAVE]:
+        if analyse_sante.etat_sante in [EtatSante.CRITIQUE, EtatSante.GRAVE]:
             recommandations.append("Prise en charge médicale spécialisée recommandée")
         
         return recommandations
     
-    def _identifier_facteurs_pronostiques(self, analyse_sante: Dict, patient_data: Dict) -> Dict:
+    def _identifier_facteurs_pronostiques(self, analyse_sante: AnalyseSante, patient_data: Dict) -> Dict:
         """Identifie les facteurs pronostiques importants"""
         return {
-            'facteur_cle_resilience': analyse_sante['resilience_patient'],
-            'facteur_cle_harmonie': analyse_sante['harmonie_biologique'],
-            'facteur_cle_gravite': analyse_sante['score_gravite'],
-            'indicateur_retablissement': analyse_sante['potentiel_retablissement'],
-            'etat_sante_global': analyse_sante['etat_sante'].label,
+            'facteur_cle_resilience': analyse_sante.resilience_patient,
+            'facteur_cle_harmonie': analyse_sante.harmonie_biologique,
+            'facteur_cle_gravite': analyse_sante.score_gravite,
+            'indicateur_retablissement': analyse_sante.potentiel_retablissement,
+            'etat_sante_global': analyse_sante.etat_sante.label,
             'score_pronostic_global': (
-                analyse_sante['potentiel_retablissement'] * 0.4 +
-                (1 - analyse_sante['score_gravite']) * 0.3 +
-                analyse_sante['resilience_patient'] * 0.3
+                analyse_sante.potentiel_retablissement * 0.4 +
+                (1 - analyse_sante.score_gravite) * 0.3 +
+                analyse_sante.resilience_patient * 0.3
             ),
-            'facteurs_aggravants': len(analyse_sante['facteurs_aggravants']),
-            'indicateurs_favorables': len(analyse_sante['indicateurs_favorables'])
+            'facteurs_aggravants': len(analyse_sante.facteurs_aggravants),
+            'indicateurs_favorables': len(analyse_sante.indicateurs_favorables)
         }
     
-    def _generer_plan_soins(self, prediction: Dict, traitements: List[Dict], patient_data: Dict) -> Dict:
+    def _generer_plan_soins(self, prediction: PredictionRetablissement, traitements: List[TraitementRecommande], patient_data: Dict) -> PlanSoins:
         """Génère un plan de soins personnalisé"""
         if not traitements:
             return self._plan_soins_defaut()
         
         meilleur_traitement = traitements[0]
         
-        return {
-            'traitement_principal': meilleur_traitement['nom'],
-            'protocole_applique': meilleur_traitement['protocole'],
-            'duree_traitement_recommandee': prediction['duree_maladie_predite'],
-            'posologie_recommandee': self._determiner_posologie(meilleur_traitement['nom'], patient_data),
-            'suivi_recommande': self._generer_calendrier_suivi(prediction['duree_maladie_predite'], prediction['evolution_predite']),
-            'criteres_amelioration': self._definir_criteres_amelioration(patient_data),
-            'actions_immediates': self._definir_actions_immediates(prediction['probabilite_succes'], patient_data),
-            'contingence': self._prevoir_contingence(traitements, prediction),
-            'recommandations_complementaires': self._generer_recommandations_complementaires(patient_data)
-        }
+        posologie, criteres, recommandations = self._generer_modele_plan_soins(
+            patient_data.get('pathologie', '').upper(),
+            patient_data.get('profil', {}).get('age', 40) >= 65,
+            meilleur_traitement.nom
+        )
+        
+        return PlanSoins(
+            traitement_principal=meilleur_traitement.nom,
+            protocole_applique=meilleur_traitement.protocole,
+            duree_traitement_recommandee=prediction.duree_maladie_predite,
+            posologie_recommandee=posologie,
+            suivi_recommande=self._generer_calendrier_suivi(prediction.duree_maladie_predite, prediction.evolution_predite),
+            criteres_amelioration=list(criteres),
+            actions_immediates=self._definir_actions_immediates(prediction.probabilite_succes, patient_data),
+            contingence=self._prevoir_contingence(traitements, prediction),
+            recommandations_complementaires=list(recommandations)
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _generer_modele_plan_soins(pathologie: str, senior: bool, traitement: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Génère la posologie, les critères d'amélioration et les recommandations
+        complémentaires d'un profil type
+        
+        Ces parties du plan ne dépendent que de la pathologie, du seuil d'âge
+        senior (65 ans) et du traitement principal : le résultat est exact pour
+        tout patient partageant ces trois valeurs et peut donc être mis en cache
+        (cache de classe, partagé par les instances sans les retenir).
+        """
+        patient_type = {'pathologie': pathologie, 'profil': {'age': 65 if senior else 40}}
+        
+        return (
+            AlgoVeriteMedical._determiner_posologie(traitement, patient_type),
+            tuple(AlgoVeriteMedical._definir_criteres_amelioration(patient_type)),
+            tuple(AlgoVeriteMedical._generer_recommandations_complementaires(patient_type))
+        )
     
-    def _determiner_posologie(self, traitement: str, patient_data: Dict) -> str:
+    @staticmethod
+    def _determiner_posologie(traitement: str, patient_data: Dict) -> str:
         """Détermine la posologie recommandée"""
         posologies = {
             'ANTIVIRAL': "1 comprimé 2 fois par jour pendant 5 jours",
@@ -917,7 +1214,7 @@ class AlgoVeriteMedical:
         
         return base_posologie
     
-    def _generer_calendrier_suivi(self, duree: int, evolution: List[Dict]) -> List[Dict]:
+    def _generer_calendrier_suivi(self, duree: int, evolution: Evolution) -> List[Dict]:
         """Génère un calendrier de suivi personnalisé"""
         calendrier = []
         
@@ -925,18 +1222,18 @@ class AlgoVeriteMedical:
         points_controle = self._determiner_points_controle(duree, evolution)
         
         for point in points_controle:
-            etat_jour = next((e for e in evolution if e['jour'] == point), None)
-            if etat_jour:
+            idx = int(np.searchsorted(evolution.jours, point))
+            if idx < len(evolution) and evolution.jours[idx] == point:
                 calendrier.append({
                     'jour': point,
-                    'objectif': self._definir_objectif_jour(point, etat_jour['etat']),
-                    'actions': etat_jour['actions_recommandees'],
+                    'objectif': self._definir_objectif_jour(point, str(evolution.etats[idx])),
+                    'actions': list(evolution.actions[idx]),
                     'critères_evaluation': self._definir_criteres_evaluation(point)
                 })
         
         return calendrier
     
-    def _determiner_points_controle(self, duree: int, evolution: List[Dict]) -> List[int]:
+    def _determiner_points_controle(self, duree: int, evolution: Evolution) -> List[int]:
         """Détermine les points de contrôle optimaux"""
         if duree <= 3:
             return list(range(1, duree + 1))
@@ -980,7 +1277,8 @@ class AlgoVeriteMedical:
         
         return criteres_base
     
-    def _definir_criteres_amelioration(self, patient_data: Dict) -> List[str]:
+    @staticmethod
+    def _definir_criteres_amelioration(patient_data: Dict) -> List[str]:
         """Définit les critères d'amélioration à surveiller"""
         pathologie = patient_data.get('pathologie', '').upper()
         criteres_generaux = [
@@ -1025,13 +1323,13 @@ class AlgoVeriteMedical:
         
         return actions
     
-    def _prevoir_contingence(self, traitements: List[Dict], prediction: Dict) -> Dict:
+    def _prevoir_contingence(self, traitements: List[TraitementRecommande], prediction: PredictionRetablissement) -> Dict:
         """Prévoit un plan de contingence"""
         if len(traitements) > 1:
             traitement_alternatif = traitements[1]
             return {
-                'traitement_alternatif': traitement_alternatif['nom'],
-                'declenchement': f"Si absence d'amélioration après {min(3, prediction['duree_maladie_predite']//2)} jours",
+                'traitement_alternatif': traitement_alternatif.nom,
+                'declenchement': f"Si absence d'amélioration après {min(3, prediction.duree_maladie_predite//2)} jours",
                 'conditions_activation': [
                     "Aggravation des symptômes",
                     "Apparition de nouveaux symptômes",
@@ -1050,7 +1348,8 @@ class AlgoVeriteMedical:
                 'actions': ["Consultation médicale urgente", "Révision du diagnostic", "Prise en charge spécialisée"]
             }
     
-    def _generer_recommandations_complementaires(self, patient_data: Dict) -> List[str]:
+    @staticmethod
+    def _generer_recommandations_complementaires(patient_data: Dict) -> List[str]:
         """Génère des recommandations complémentaires"""
         recommandations = [
             "Repos adapté à l'état de santé",
@@ -1074,34 +1373,34 @@ class AlgoVeriteMedical:
         
         return recommandations
     
-    def _plan_soins_defaut(self) -> Dict:
+    def _plan_soins_defaut(self) -> PlanSoins:
         """Retourne un plan de soins par défaut"""
-        return {
-            'traitement_principal': "Soins symptomatiques",
-            'protocole_applique': "PROTOCOLE_STANDARD",
-            'duree_traitement_recommandee': 7,
-            'posologie_recommandee': "Selon symptômes",
-            'suivi_recommande': [{'jour': 3, 'actions': ["Évaluation de l'état général"]}],
-            'criteres_amelioration': ["Réduction des symptômes principaux"],
-            'actions_immediates': ["Repos", "Hydratation", "Surveillance"],
-            'contingence': {'actions': ["Consulter en cas d'aggravation"]},
-            'recommandations_complementaires': ["Consultation médicale pour diagnostic précis"]
-        }
+        return PlanSoins(
+            traitement_principal="Soins symptomatiques",
+            protocole_applique="PROTOCOLE_STANDARD",
+            duree_traitement_recommandee=7,
+            posologie_recommandee="Selon symptômes",
+            suivi_recommande=[{'jour': 3, 'actions': ["Évaluation de l'état général"]}],
+            criteres_amelioration=["Réduction des symptômes principaux"],
+            actions_immediates=["Repos", "Hydratation", "Surveillance"],
+            contingence={'actions': ["Consulter en cas d'aggravation"]},
+            recommandations_complementaires=["Consultation médicale pour diagnostic précis"]
+        )
     
-    def _generer_recommandations_suivi(self, prediction: Dict, patient_data: Dict) -> List[str]:
+    def _generer_recommandations_suivi(self, prediction: PredictionRetablissement, patient_data: Dict) -> List[str]:
         """Génère des recommandations de suivi"""
         recommandations = [
-            f"Suivi médical pendant {prediction['duree_maladie_predite']} jours",
+            f"Suivi médical pendant {prediction.duree_maladie_predite} jours",
             "Signalement immédiat de toute aggravation",
             "Respect strict du traitement prescrit",
             "Tenue d'un journal des symptômes"
         ]
         
-        if prediction['probabilite_succes'] < 0.7:
+        if prediction.probabilite_succes < 0.7:
             recommandations.append("Surveillance rapprochée recommandée")
             recommandations.append("Prévoir une consultation de contrôle à J+3")
         
-        if prediction['probabilite_succes'] < 0.5:
+        if prediction.probabilite_succes < 0.5:
             recommandations.append("Envisager une hospitalisation si état stationnaire")
             recommandations.append("Mise en place de soins de support intensifs")
         
@@ -1111,48 +1410,45 @@ class AlgoVeriteMedical:
         
         return recommandations
     
-    def _calculer_confiance_globale(self, analyse_sante: Dict, prediction: Dict, traitements: List[Dict]) -> float:
+    def _calculer_confiance_globale(self, analyse_sante: AnalyseSante, prediction: PredictionRetablissement, traitements: List[TraitementRecommande]) -> float:
         """Calcule le score de confiance global de l'analyse"""
         facteurs = []
         
         # Confiance dans l'analyse de l'état
-        facteurs.append(analyse_sante['harmonie_biologique'])
+        facteurs.append(analyse_sante.harmonie_biologique)
         
-        # Confiance dans les traitements
-        if traitements:
-            facteurs.append(max(t['score_global'] for t in traitements))
-        else:
-            facteurs.append(0.3)
+        # Confiance dans les traitements (liste triée, le meilleur en tête)
+        facteurs.append(traitements[0].score_global if traitements else 0.3)
         
         # Confiance dans la prédiction
-        facteurs.append(prediction['niveau_confiance'])
+        facteurs.append(prediction.niveau_confiance)
         
         # Stabilité structurelle
-        facteurs.append(1.0 if self._evaluer_stabilite_structurelle(analyse_sante['pyramide_sante']) else 0.7)
+        facteurs.append(1.0 if self._evaluer_stabilite_structurelle(analyse_sante.pyramide_sante) else 0.7)
         
         # Cohérence globale
         coherence = 1.0 - abs(
-            analyse_sante['potentiel_retablissement'] - 
-            prediction['probabilite_succes']
+            analyse_sante.potentiel_retablissement - 
+            prediction.probabilite_succes
         )
         facteurs.append(coherence)
         
         return sum(facteurs) / len(facteurs)
     
-    def _generer_avertissements(self, analyse_sante: Dict, prediction: Dict) -> List[str]:
+    def _generer_avertissements(self, analyse_sante: AnalyseSante, prediction: PredictionRetablissement) -> List[str]:
         """Génère des avertissements basés sur l'analyse"""
         avertissements = []
         
-        if analyse_sante['etat_sante'] in [EtatSante.CRITIQUE, EtatSante.GRAVE]:
+        if analyse_sante.etat_sante in [EtatSante.CRITIQUE, EtatSante.GRAVE]:
             avertissements.append("État de santé préoccupant - surveillance médicale requise")
         
-        if prediction['probabilite_succes'] < 0.4:
+        if prediction.probabilite_succes < 0.4:
             avertissements.append("Pronostic réservé - nécessité d'une prise en charge spécialisée")
         
-        if len(analyse_sante['facteurs_aggravants']) >= 3:
+        if len(analyse_sante.facteurs_aggravants) >= 3:
             avertissements.append("Multiples facteurs de risque - vigilance accrue nécessaire")
         
-        if analyse_sante['resilience_patient'] < 0.3:
+        if analyse_sante.resilience_patient < 0.3:
             avertissements.append("Faible résilience détectée - récupération potentiellement prolongée")
         
         return avertissements
@@ -1240,18 +1536,38 @@ ACTIONS IMMÉDIATES
 
     def analyser_cohorte(self, patients_data: List[Dict]) -> Dict:
         """Analyse une cohorte de patients pour la recherche"""
-        analyses = []
+        analyses = [None] * len(patients_data)
         
-        for patient_data in patients_data:
+        # Passe 1 : analyse de la condition et recherche des traitements
+        preparations = []
+        for index, patient_data in enumerate(patients_data):
             try:
-                analyse = self.analyser_patient(patient_data)
-                analyses.append(analyse)
+                analyse_sante, traitements = self._preparer_analyse(patient_data)
+                preparations.append((index, patient_data, analyse_sante, traitements))
             except Exception as e:
-                analyses.append({
-                    'patient_id': patient_data.get('id', 'INCONNU'),
-                    'erreur': str(e),
-                    'statut': 'ÉCHEC_ANALYSE'
-                })
+                analyses[index] = self._analyse_echec(patient_data, e)
+        
+        # Passe 2 : évolution de toute la cohorte en une seule opération
+        evolutions = {}
+        avec_traitement = [p for p in preparations if p[3]]
+        if avec_traitement:
+            scores = self._predire_evolution_batch(
+                np.array([p[2].score_gravite for p in avec_traitement]),
+                np.array([p[2].resilience_patient for p in avec_traitement]),
+                np.array([self._predire_duree_patient(p[1], p[2], p[3]) for p in avec_traitement])
+            )
+            etats = self._determiner_etats_from_scores(np.nan_to_num(scores))
+            for ligne, (index, _, _, _) in enumerate(avec_traitement):
+                evolutions[index] = self._construire_evolution(scores[ligne], etats[ligne])
+        
+        # Passe 3 : prédiction, plan de soins et archivage
+        for index, patient_data, analyse_sante, traitements in preparations:
+            try:
+                analyses[index] = self._finaliser_analyse(
+                    patient_data, analyse_sante, traitements, evolutions.get(index)
+                )
+            except Exception as e:
+                analyses[index] = self._analyse_echec(patient_data, e)
         
         # Statistiques de la cohorte
         analyses_reussies = [a for a in analyses if 'erreur' not in a]
@@ -1279,6 +1595,14 @@ ACTIONS IMMÉDIATES
             'recommandations_cohorte': self._generer_recommandations_cohorte(analyses_reussies)
         }
     
+    def _analyse_echec(self, patient_data: Dict, erreur: Exception) -> Dict:
+        """Retourne l'entrée de cohorte d'un patient dont l'analyse a échoué"""
+        return {
+            'patient_id': patient_data.get('id', 'INCONNU'),
+            'erreur': str(erreur),
+            'statut': 'ÉCHEC_ANALYSE'
+        }
+    
     def _generer_recommandations_cohorte(self, analyses: List[Dict]) -> List[str]:
         """Génère des recommandations pour la cohorte"""
         if not analyses:
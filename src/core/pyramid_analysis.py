@@ -1,8 +1,16 @@
+import copy
 import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
 class PyramidType(Enum):
     PERFECT = "PYRAMIDE_PARFAITE"
     STABLE = "PYRAMIDE_STABLE"
@@ -12,23 +20,144 @@ class PyramidType(Enum):
 
 @dataclass
 class PyramidMetrics:
+    __slots__ = (
+        'height', 'width', 'stability_score', 'symmetry_score', 'convergence_speed', 'entropy'
+    )
+    
     height: int
     width: int
     stability_score: float
     symmetry_score: float
     convergence_speed: float
     entropy: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'height': self.height,
+            'width': self.width,
+            'stability_score': self.stability_score,
+            'symmetry_score': self.symmetry_score,
+            'convergence_speed': self.convergence_speed,
+            'entropy': self.entropy
+        }
+    
+    def as_vector(self) -> np.ndarray:
+        """Métriques sous forme de vecteur (hauteur, stabilité, symétrie, convergence, entropie)"""
+        return np.array([
+            self.height, self.stability_score, self.symmetry_score, self.convergence_speed, self.entropy
+        ], dtype=float)
+
+if _HAS_NUMBA:
+    @njit(cache=True)
+    def _build_pyramid_nb(base):
+        """
+        Construit les deux moitiés de la pyramide dans un seul tampon de deux lignes
+        
+        Le niveau k (1 <= k < n, n valeurs de moins à chaque niveau) occupe
+        upper[offsets[k-1]:offsets[k]] et lower[offsets[k-1]:offsets[k]].
+        """
+        n = base.shape[0]
+        total = n * (n - 1) // 2
+        levels = np.empty((2, total), dtype=np.int64)
+        upper, lower = levels[0], levels[1]
+        offsets = np.empty(n, dtype=np.int64)
+        
+        offset = 0
+        for k in range(1, n):
+            offsets[k - 1] = offset
+            size = n - k
+            if k == 1:
+                for i in range(size):
+                    upper[i] = base[i] + base[i + 1]
+                    lower[i] = abs(base[i] - base[i + 1])
+            else:
+                prev = offsets[k - 2]
+                for i in range(size):
+                    upper[offset + i] = upper[prev + i] + upper[prev + i + 1]
+                    lower[offset + i] = abs(lower[prev + i] - lower[prev + i + 1])
+            offset += size
+        offsets[n - 1] = offset
+        
+        return upper, lower, offsets
+    
+    @njit(cache=True)
+    def _entropy_nb(values):
+        """Entropie de Shannon des valeurs normalisées, sans tableau intermédiaire"""
+        total = 0.0
+        for x in values:
+            total += x
+        entropy = 0.0
+        if total != 0:
+            for x in values:
+                p = x / total
+                if p > 0:
+                    entropy -= p * np.log(p)
+        return entropy
+    
+    @njit(cache=True)
+    def _metrics_kernel(base, final_level):
+        """Calcule stabilité (dernier niveau) et entropie (base) sans tableau intermédiaire"""
+        n = final_level.shape[0]
+        stability = 1.0
+        if n > 1:
+            mean = 0.0
+            for x in final_level:
+                mean += x
+            mean /= n
+            squares = 0.0
+            for x in final_level:
+                squares += (x - mean) * (x - mean)
+            variation = np.sqrt(squares / n) / (mean if mean != 0 else 1.0)
+            stability = 1.0 - variation
+            if not stability > 0:
+                stability = 0.0
+        
+        return stability, _entropy_nb(base)
 
 class PyramidAnalyzer:
     """
     Analyse spécialisée des structures pyramidales
     """
     
+    ANALYSIS_CACHE_SIZE = 4096
+    
+    PYRAMID_TYPES = (
+        PyramidType.PERFECT,
+        PyramidType.STABLE,
+        PyramidType.HARMONIOUS,
+        PyramidType.UNSTABLE,
+        PyramidType.CHAOTIC
+    )
+    
+    COMPATIBILITY_THRESHOLDS = np.array([0.5, 0.7, 0.9])
+    COMPATIBILITY_LABELS = np.array([
+        "FAIBLE COMPATIBILITÉ",
+        "COMPATIBILITÉ MODÉRÉE",
+        "HAUTE COMPATIBILITÉ",
+        "COMPATIBILITÉ PARFAITE"
+    ])
+    
     def __init__(self):
         self.analysis_cache = {}
     
     def analyze_pyramid_structure(self, base_sequence: List[int]) -> Dict[str, Any]:
-        """Analyse approfondie de la structure pyramidale"""
+        """
+        Analyse approfondie de la structure pyramidale
+        
+        Les analyses sont mémorisées par séquence de base (LRU borné) ; chaque
+        appel reçoit une copie, modifiable sans altérer le cache.
+        """
+        key = tuple(base_sequence)
+        analysis = self.analysis_cache.pop(key, None)
+        if analysis is None:
+            analysis = self._analyze_pyramid(list(key))
+            if len(self.analysis_cache) >= self.ANALYSIS_CACHE_SIZE:
+                del self.analysis_cache[next(iter(self.analysis_cache))]
+        self.analysis_cache[key] = analysis
+        return copy.deepcopy(analysis)
+    
+    def _analyze_pyramid(self, base_sequence: List[int]) -> Dict[str, Any]:
+        """Construit et analyse la pyramide d'une séquence de base"""
         
         # Construction de la pyramide
         pyramid = self._build_pyramid(base_sequence)
@@ -43,37 +172,58 @@ class PyramidAnalyzer:
         patterns = self._detect_patterns(pyramid, metrics)
         
         return {
-            'pyramid': pyramid,
-            'metrics': metrics.__dict__,
+            'pyramid': self._pyramid_to_lists(pyramid),
+            'metrics': metrics.to_dict(),
             'type': pyramid_type.value,
             'patterns': patterns,
             'recommendations': self._generate_recommendations(metrics, pyramid_type)
         }
     
-    def _build_pyramid(self, base: List[int]) -> Dict[str, List[List[int]]]:
-        """Construit la pyramide complète"""
+    def _build_pyramid(self, base: List[int]) -> Dict[str, List[np.ndarray]]:
+        """Construit la pyramide complète (niveaux stockés en tableaux NumPy)"""
         pyramid = {
             'base': base,
             'upper': [],
             'lower': []
         }
         
-        # Partie supérieure
-        current = base.copy()
-        while len(current) > 1:
-            next_level = [current[i] + current[i+1] for i in range(len(current)-1)]
-            pyramid['upper'].insert(0, next_level)
-            current = next_level
+        base_array = self._as_level_array(base)
         
-        # Partie inférieure
-        current = base.copy()
-        while len(current) > 1:
-            next_level = [abs(current[i] - current[i+1]) for i in range(len(current)-1)]
-            pyramid['lower'].append(next_level)
-            current = next_level
+        if _HAS_NUMBA and base_array.dtype == np.int64 and base_array.size > 1:
+            upper, lower, offsets = _build_pyramid_nb(base_array)
+            bounds = list(zip(offsets[:-1], offsets[1:]))
+            pyramid['upper'] = [upper[start:end] for start, end in reversed(bounds)]
+            pyramid['lower'] = [lower[start:end] for start, end in bounds]
+            return pyramid
+        
+        # Parties supérieure (sommes) et inférieure (différences absolues) en une passe
+        upper = lower = base_array
+        while upper.size > 1:
+            upper = upper[1:] + upper[:-1]
+            lower = np.abs(lower[1:] - lower[:-1])
+            pyramid['upper'].append(upper)
+            pyramid['lower'].append(lower)
+        pyramid['upper'].reverse()
         
         return pyramid
     
+    def _as_level_array(self, base: List[int]) -> np.ndarray:
+        """Convertit la base en tableau, en int64 tant que les sommes ne peuvent pas déborder"""
+        base_array = np.asarray(base)
+        if base_array.dtype.kind in 'iu' and base_array.size:
+            # Le sommet vaut au plus max|x| * 2^(n-1)
+            bound = int(np.abs(base_array).max()) << (base_array.size - 1)
+            base_array = base_array.astype(np.int64 if bound < 2 ** 63 else object)
+        return base_array
+    
+    def _pyramid_to_lists(self, pyramid: Dict) -> Dict[str, List[List[int]]]:
+        """Convertit les niveaux de la pyramide en listes Python"""
+        return {
+            'base': pyramid['base'],
+            'upper': [level.tolist() for level in pyramid['upper']],
+            'lower': [level.tolist() for level in pyramid['lower']]
+        }
+    
     def _calculate_pyramid_metrics(self, pyramid: Dict) -> PyramidMetrics:
         """Calcule les métriques de la pyramide"""
         
@@ -81,8 +231,8 @@ class PyramidAnalyzer:
         upper_height = len(pyramid['upper'])
         lower_height = len(pyramid['lower'])
         
-        # Score de stabilité
-        stability = self._calculate_stability(pyramid)
+        # Scores de stabilité et d'entropie de la base
+        stability, entropy = self._calculate_stability_entropy(pyramid)
         
         # Score de symétrie
         symmetry = 1.0 - (abs(upper_height - lower_height) / max(upper_height, lower_height, 1))
@@ -90,9 +240,6 @@ class PyramidAnalyzer:
         # Vitesse de convergence
         convergence = lower_height / base_len if base_len > 0 else 0
         
-        # Entropie de la base
-        entropy = self._calculate_entropy(pyramid['base'])
-        
         return PyramidMetrics(
             height=max(upper_height, lower_height),
             width=base_len,
@@ -102,6 +249,16 @@ class PyramidAnalyzer:
             entropy=entropy
         )
     
+    def _calculate_stability_entropy(self, pyramid: Dict) -> Tuple[float, float]:
+        """Calcule stabilité et entropie, en une seule passe compilée si Numba est disponible"""
+        if _HAS_NUMBA:
+            base = np.asarray(pyramid['base'])
+            final_level = np.asarray(pyramid['lower'][-1] if pyramid['lower'] else ())
+            if base.dtype.kind in 'iuf' and final_level.dtype.kind in 'iuf':
+                return _metrics_kernel(base.astype(np.float64), final_level.astype(np.float64))
+        
+        return self._calculate_stability(pyramid), self._calculate_entropy(pyramid['base'])
+    
     def _calculate_stability(self, pyramid: Dict) -> float:
         """Calcule le score de stabilité"""
         if not pyramid['lower']:
@@ -120,44 +277,53 @@ class PyramidAnalyzer:
         if not sequence:
             return 0
         
+        seq_array = np.asarray(sequence, dtype=float)
+        if _HAS_NUMBA:
+            return _entropy_nb(seq_array)
+        
         # Normalisation
-        seq_array = np.array(sequence)
-        if np.sum(seq_array) == 0:
+        total = np.sum(seq_array)
+        if total == 0:
             return 0
         
-        probabilities = seq_array / np.sum(seq_array)
-        probabilities = probabilities[probabilities > 0]  # Éviter log(0)
+        probabilities = seq_array / total
+        positive = probabilities > 0  # Éviter log(0)
         
-        return float(-np.sum(probabilities * np.log(probabilities)))
+        return float(-np.sum(np.where(positive, probabilities * np.log(np.where(positive, probabilities, 1)), 0)))
     
     def _classify_pyramid(self, metrics: PyramidMetrics) -> PyramidType:
         """Classifie le type de pyramide"""
-        
-        if metrics.symmetry_score > 0.9 and metrics.stability_score > 0.9:
-            return PyramidType.PERFECT
-        elif metrics.stability_score > 0.7:
-            return PyramidType.STABLE
-        elif metrics.symmetry_score > 0.8:
-            return PyramidType.HARMONIOUS
-        elif metrics.stability_score < 0.3:
-            return PyramidType.UNSTABLE
-        else:
-            return PyramidType.CHAOTIC
+        index = self.classify_batch(np.array([metrics.symmetry_score]), np.array([metrics.stability_score]))[0]
+        return self.PYRAMID_TYPES[index]
+    
+    def classify_batch(self, symmetry: np.ndarray, stability: np.ndarray) -> np.ndarray:
+        """Classifie un lot de pyramides ; renvoie les indices dans PYRAMID_TYPES"""
+        symmetry, stability = np.asarray(symmetry), np.asarray(stability)
+        conditions = [
+            (symmetry > 0.9) & (stability > 0.9),
+            stability > 0.7,
+            symmetry > 0.8,
+            stability < 0.3
+        ]
+        return np.select(conditions, [0, 1, 2, 3], default=4)
     
     def _detect_patterns(self, pyramid: Dict, metrics: PyramidMetrics) -> List[str]:
         """Détecte les patterns dans la pyramide"""
         patterns = []
+        base = tuple(pyramid['base'])
+        
+        is_arithmetic, is_geometric, is_fibonacci = self._sequence_signatures(base)
         
         # Pattern de Fibonacci
-        if self._is_fibonacci_like(pyramid['base']):
+        if is_fibonacci:
             patterns.append("Séquence de type Fibonacci")
         
         # Pattern géométrique
-        if self._is_geometric_sequence(pyramid['base']):
+        if is_geometric:
             patterns.append("Progression géométrique")
         
         # Pattern arithmétique
-        if self._is_arithmetic_sequence(pyramid['base']):
+        if is_arithmetic:
             patterns.append("Progression arithmétique")
         
         # Pattern de convergence rapide
@@ -170,36 +336,29 @@ class PyramidAnalyzer:
         
         return patterns
     
-    def _is_fibonacci_like(self, sequence: List[int]) -> bool:
-        """Vérifie si la séquence ressemble à Fibonacci"""
-        if len(sequence) < 3:
-            return False
-        
-        for i in range(2, len(sequence)):
-            if sequence[i] != sequence[i-1] + sequence[i-2]:
-                return False
-        return True
-    
-    def _is_geometric_sequence(self, sequence: List[int]) -> bool:
-        """Vérifie si c'est une suite géométrique"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _sequence_signatures(sequence: Tuple[int, ...]) -> Tuple[bool, bool, bool]:
+        """
+        Détecte en une passe si la séquence est arithmétique, géométrique ou de type Fibonacci
+        
+        Les différences successives servent aux trois tests : une faible variation
+        des différences (arithmétique), d[i+1] == a[i] (Fibonacci), et une faible
+        variation des ratios a[i+1] / a[i] (géométrique).
+        """
         if len(sequence) < 2:
-            return False
+            return False, False, False
         
-        ratios = []
-        for i in range(1, len(sequence)):
-            if sequence[i-1] == 0:
-                return False
-            ratios.append(sequence[i] / sequence[i-1])
+        values = np.asarray(sequence)
+        differences = np.diff(values)
         
-        return np.std(ratios) < 0.1  # Faible variation des ratios
-    
-    def _is_arithmetic_sequence(self, sequence: List[int]) -> bool:
-        """Vérifie si c'est une suite arithmétique"""
-        if len(sequence) < 2:
-            return False
+        is_arithmetic = np.std(differences) < 0.1  # Faible variation des différences
+        is_fibonacci = len(sequence) >= 3 and not np.any(differences[1:] - values[:-2])
         
-        differences = [sequence[i] - sequence[i-1] for i in range(1, len(sequence))]
-        return np.std(differences) < 0.1  # Faible variation des différences
+        previous = values[:-1].astype(float)
+        is_geometric = bool(np.all(previous)) and np.std(values[1:].astype(float) / previous) < 0.1
+        
+        return bool(is_arithmetic), bool(is_geometric), bool(is_fibonacci)
     
     def _generate_recommendations(self, metrics: PyramidMetrics, pyramid_type: PyramidType) -> List[str]:
         """Génère des recommandations basées sur l'analyse"""
@@ -232,26 +391,17 @@ class PyramidAnalyzer:
         return {
             'similarity_score': similarity_score,
             'metrics_differences': self._compare_metrics(metrics1, metrics2),
-            'compatibility': self._assess_compatibility(metrics1, metrics2)
+            'compatibility': self._assess_compatibility(similarity_score)
         }
     
-    def _calculate_pyramid_similarity(self, metrics1: PyramidMetrics, metrics2: PyramidMetrics) -> float:
-        """Calcule la similarité entre deux pyramides"""
-        similarities = []
-        
-        # Similarité de hauteur
-        height_sim = 1 - abs(metrics1.height - metrics2.height) / max(metrics1.height, metrics2.height, 1)
-        similarities.append(height_sim)
-        
-        # Similarité de stabilité
-        stability_sim = 1 - abs(metrics1.stability_score - metrics2.stability_score)
-        similarities.append(stability_sim)
-        
-        # Similarité de symétrie
-        symmetry_sim = 1 - abs(metrics1.symmetry_score - metrics2.symmetry_score)
-        similarities.append(symmetry_sim)
-        
-        return np.mean(similarities)
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _calculate_pyramid_similarity(metrics1: PyramidMetrics, metrics2: PyramidMetrics) -> float:
+        """Calcule la similarité (hauteur, stabilité, symétrie) entre deux pyramides"""
+        v1, v2 = metrics1.as_vector()[:3], metrics2.as_vector()[:3]
+        scale = np.array([max(metrics1.height, metrics2.height, 1), 1.0, 1.0])
+        
+        return np.mean(1 - np.abs(v1 - v2) / scale)
     
     def _compare_metrics(self, metrics1: PyramidMetrics, metrics2: PyramidMetrics) -> Dict[str, float]:
         """Compare les métriques individuelles"""
@@ -262,15 +412,14 @@ class PyramidAnalyzer:
             'convergence_difference': abs(metrics1.convergence_speed - metrics2.convergence_speed)
         }
     
-    def _assess_compatibility(self, metrics1: PyramidMetrics, metrics2: PyramidMetrics) -> str:
-        """Évalue la compatibilité entre deux pyramides"""
-        similarity = self._calculate_pyramid_similarity(metrics1, metrics2)
-        
-        if similarity > 0.9:
-            return "COMPATIBILITÉ PARFAITE"
-        elif similarity > 0.7:
-            return "HAUTE COMPATIBILITÉ"
-        elif similarity > 0.5:
-            return "COMPATIBILITÉ MODÉRÉE"
-        else:
-            return "FAIBLE COMPATIBILITÉ"
\ No newline at end of file
+    def _assess_compatibility(self, similarity: float) -> str:
+        """Évalue la compatibilité entre deux pyramides à partir de leur similarité"""
+        return str(self.assess_compatibility_batch(np.array([similarity]))[0])
+    
+    def assess_compatibility_batch(self, similarities: np.ndarray) -> np.ndarray:
+        """Évalue la compatibilité d'un lot de similarités"""
+        similarities = np.asarray(similarities, dtype=float)
+        # Seuils stricts : une similarité égale à un seuil reste dans la classe inférieure
+        index = np.searchsorted(self.COMPATIBILITY_THRESHOLDS, similarities, side='left')
+        index[np.isnan(similarities)] = 0
+        return self.COMPATIBILITY_LABELS[index]
\ No newline at end of file
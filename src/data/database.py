@@ -1,11 +1,63 @@
 import sqlite3
 import json
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
+from enum import Enum
 import logging
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
+def _dumps_json(data: Any) -> str:
+    """Sérialise en texte JSON (colonnes interrogées par les fonctions JSON de SQLite)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def _loads_json(value: Any) -> Any:
+    """Désérialise un texte JSON"""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+def _pack_default(obj: Any) -> Any:
+    """Convertit les tableaux et scalaires NumPy et les énumérations pour msgpack"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Type non sérialisable: {type(obj).__name__}")
+
+def _pack_payload(data: Any) -> Any:
+    """Sérialise une charge utile en BLOB msgpack, ou en texte JSON à défaut"""
+    if msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True, default=_pack_default)
+    return _dumps_json(data)
+
+def _unpack_payload(value: Any) -> Any:
+    """
+    Désérialise une charge utile msgpack ou JSON
+    
+    Les charges sont des objets ou des listes : leur premier octet msgpack est
+    >= 0x80 alors qu'un document JSON (anciennes lignes) commence en ASCII.
+    """
+    if isinstance(value, bytes) and value and value[0] >= 0x80:
+        if msgpack is None:
+            raise RuntimeError("Charge utile msgpack en base mais le module msgpack n'est pas installé")
+        return msgpack.unpackb(value, raw=False, strict_map_key=False)
+    return _loads_json(value)
+
 class DatabaseManager:
     """
     Gestionnaire de base de données pour Algo Vérité Médical
@@ -13,12 +65,29 @@ class DatabaseManager:
     
     def __init__(self, db_path: str = "algo_verite_medical.db"):
         self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = self._connect()
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Ouvre la connexion partagée et la configure une seule fois"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')
+        return conn
+    
+    def close(self):
+        """Ferme la connexion à la base de données"""
+        with self._lock:
+            self._conn.close()
+    
     def _init_database(self):
         """Initialise la structure de la base de données"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 # Table des patients
                 conn.execute('''
                     CREATE TABLE IF NOT EXISTS patients (
@@ -69,11 +138,19 @@ class DatabaseManager:
                     )
                 ''')
                 
+                # Index des recherches par patient et des tris par date
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_analyses_patient ON analyses (patient_id, created_at DESC)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_followups_patient_day ON follow_ups (patient_id, day_number)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_patients_updated ON patients (updated_at DESC)')
+                
+                # Même expression que les regroupements par pathologie de get_statistics
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_patients_pathology ON patients (json_extract(data, '$.pathologie'))")
+                
                 conn.commit()
                 logger.info("Base de données initialisée avec succès")
                 
         except Exception as e:
-            logger.error(f"Erreur lors de l'initialisation de la base de données: {e}")
+            logger.error("Erreur lors de l'initialisation de la base de données: %s", e)
             raise
     
     def save_patient(self, patient_data: Dict[str, Any]) -> str:
@@ -81,18 +158,45 @@ class DatabaseManager:
         try:
             patient_id = patient_data.get('id', f"PAT_{datetime.now().strftime('%Y%m%d%H%M%S')}")
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 conn.execute('''
                     INSERT OR REPLACE INTO patients (id, data, updated_at)
                     VALUES (?, ?, ?)
-                ''', (patient_id, json.dumps(patient_data), datetime.now().isoformat()))
+                ''', (patient_id, _dumps_json(patient_data), datetime.now().isoformat()))
                 
                 conn.commit()
-                logger.info(f"Patient sauvegardé: {patient_id}")
+                logger.debug("Patient sauvegardé: %s", patient_id)
                 return patient_id
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde du patient: {e}")
+            logger.error("Erreur lors de la sauvegarde du patient: %s", e)
+            raise
+    
+    def save_patients_bulk(self, patients: List[Dict[str, Any]]) -> List[str]:
+        """Sauvegarde plusieurs patients en une seule transaction"""
+        try:
+            now = datetime.now()
+            stamp, updated_at = now.strftime('%Y%m%d%H%M%S'), now.isoformat()
+            
+            rows = [
+                (patient_data.get('id', f"PAT_{stamp}_{i}"), _dumps_json(patient_data), updated_at)
+                for i, patient_data in enumerate(patients)
+            ]
+            
+            with self._lock, self._conn as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.executemany('''
+                    INSERT OR REPLACE INTO patients (id, data, updated_at)
+                    VALUES (?, ?, ?)
+                ''', rows)
+            
+            logger.info("%s patients sauvegardés", len(rows))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Patients sauvegardés: %s", ", ".join(row[0] for row in rows))
+            return [row[0] for row in rows]
+            
+        except Exception as e:
+            logger.error("Erreur lors de la sauvegarde groupée des patients: %s", e)
             raise
     
     def save_analysis(self, patient_id: str, analysis_data: Dict[str, Any]) -> str:
@@ -100,52 +204,50 @@ class DatabaseManager:
         try:
             analysis_id = f"ANA_{datetime.now().strftime('%Y%m%d%H%M%S')}"
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 conn.execute('''
                     INSERT INTO analyses (id, patient_id, analysis_data, pyramid_structure, predictions)
                     VALUES (?, ?, ?, ?, ?)
                 ''', (
                     analysis_id,
                     patient_id,
-                    json.dumps(analysis_data),
-                    json.dumps(analysis_data.get('pyramide_sante', {})),
-                    json.dumps(analysis_data.get('prediction_retablissement', {}))
+                    _pack_payload(analysis_data),
+                    _pack_payload(analysis_data.get('pyramide_sante', {})),
+                    _pack_payload(analysis_data.get('prediction_retablissement', {}))
                 ))
                 
                 conn.commit()
-                logger.info(f"Analyse sauvegardée: {analysis_id} pour patient: {patient_id}")
+                logger.debug("Analyse sauvegardée: %s pour patient: %s", analysis_id, patient_id)
                 return analysis_id
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde de l'analyse: {e}")
+            logger.error("Erreur lors de la sauvegarde de l'analyse: %s", e)
             raise
     
     def get_patient(self, patient_id: str) -> Optional[Dict[str, Any]]:
         """Récupère un patient par son ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._lock, self._conn as conn:
                 cursor = conn.execute('SELECT * FROM patients WHERE id = ?', (patient_id,))
                 row = cursor.fetchone()
                 
                 if row:
                     return {
                         'id': row['id'],
-                        'data': json.loads(row['data']),
+                        'data': _loads_json(row['data']),
                         'created_at': row['created_at'],
                         'updated_at': row['updated_at']
                     }
                 return None
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération du patient: {e}")
+            logger.error("Erreur lors de la récupération du patient: %s", e)
             return None
     
     def get_patient_analyses(self, patient_id: str) -> List[Dict[str, Any]]:
         """Récupère toutes les analyses d'un patient"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._lock, self._conn as conn:
                 cursor = conn.execute('SELECT * FROM analyses WHERE patient_id = ? ORDER BY created_at DESC', (patient_id,))
                 rows = cursor.fetchall()
                 
@@ -154,64 +256,108 @@ class DatabaseManager:
                     analyses.append({
                         'id': row['id'],
                         'patient_id': row['patient_id'],
-                        'analysis_data': json.loads(row['analysis_data']),
-                        'pyramid_structure': json.loads(row['pyramid_structure']),
-                        'predictions': json.loads(row['predictions']),
+                        'analysis_data': _unpack_payload(row['analysis_data']),
+                        'pyramid_structure': _unpack_payload(row['pyramid_structure']),
+                        'predictions': _unpack_payload(row['predictions']),
                         'created_at': row['created_at']
                     })
                 
                 return analyses
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération des analyses: {e}")
+            logger.error("Erreur lors de la récupération des analyses: %s", e)
             return []
     
     def get_all_patients(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Récupère tous les patients"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute('SELECT * FROM patients ORDER BY updated_at DESC LIMIT ?', (limit,))
-                rows = cursor.fetchall()
-                
-                patients = []
-                for row in rows:
-                    patients.append({
-                        'id': row['id'],
-                        'data': json.loads(row['data']),
-                        'created_at': row['created_at'],
-                        'updated_at': row['updated_at']
-                    })
-                
-                return patients
+            return list(self.iter_patients(limit=limit))
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération des patients: {e}")
+            logger.error("Erreur lors de la récupération des patients: %s", e)
             return []
     
+    def iter_patients(self, limit: Optional[int] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Parcourt les patients du plus récent au plus ancien, par pages de batch_size lignes"""
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT * FROM patients ORDER BY updated_at DESC LIMIT ?',
+                (-1 if limit is None else limit,)
+            )
+        
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            
+            for row in rows:
+                yield {
+                    'id': row['id'],
+                    'data': _loads_json(row['data']),
+                    'created_at': row['created_at'],
+                    'updated_at': row['updated_at']
+                }
+    
     def add_follow_up(self, patient_id: str, day_number: int, health_status: str, symptoms: List[str], notes: str = ""):
         """Ajoute une entrée de suivi"""
         try:
             follow_up_id = f"FU_{datetime.now().strftime('%Y%m%d%H%M%S')}"
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 conn.execute('''
                     INSERT INTO follow_ups (id, patient_id, day_number, health_status, symptoms, notes)
                     VALUES (?, ?, ?, ?, ?, ?)
-                ''', (follow_up_id, patient_id, day_number, health_status, json.dumps(symptoms), notes))
+                ''', (follow_up_id, patient_id, day_number, health_status, _pack_payload(symptoms), notes))
                 
                 conn.commit()
-                logger.info(f"Suivi ajouté: {follow_up_id} pour patient: {patient_id}")
+                logger.debug("Suivi ajouté: %s pour patient: %s", follow_up_id, patient_id)
                 
         except Exception as e:
-            logger.error(f"Erreur lors de l'ajout du suivi: {e}")
+            logger.error("Erreur lors de l'ajout du suivi: %s", e)
+            raise
+    
+    def add_follow_ups_bulk(self, follow_ups: List[Dict[str, Any]]):
+        """
+        Ajoute plusieurs entrées de suivi en une seule transaction
+        
+        Chaque entrée reprend les paramètres de add_follow_up: patient_id,
+        day_number, health_status, symptoms et notes (optionnel).
+        """
+        try:
+            stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+            
+            rows = [
+                (
+                    f"FU_{stamp}_{i}",
+                    follow_up['patient_id'],
+                    follow_up['day_number'],
+                    follow_up['health_status'],
+                    _pack_payload(follow_up['symptoms']),
+                    follow_up.get('notes', "")
+                )
+                for i, follow_up in enumerate(follow_ups)
+            ]
+            
+            with self._lock, self._conn as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.executemany('''
+                    INSERT INTO follow_ups (id, patient_id, day_number, health_status, symptoms, notes)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+            
+            logger.info("%s suivis ajoutés", len(rows))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Suivis ajoutés: %s", ", ".join(row[0] for row in rows))
+            
+        except Exception as e:
+            logger.error("Erreur lors de l'ajout groupé des suivis: %s", e)
             raise
     
     def get_patient_follow_ups(self, patient_id: str) -> List[Dict[str, Any]]:
         """Récupère le suivi d'un patient"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._lock, self._conn as conn:
                 cursor = conn.execute(
                     'SELECT * FROM follow_ups WHERE patient_id = ? ORDER BY day_number ASC', 
                     (patient_id,)
@@ -225,7 +371,7 @@ class DatabaseManager:
                         'patient_id': row['patient_id'],
                         'day_number': row['day_number'],
                         'health_status': row['health_status'],
-                        'symptoms': json.loads(row['symptoms']),
+                        'symptoms': _unpack_payload(row['symptoms']),
                         'notes': row['notes'],
                         'created_at': row['created_at']
                     })
@@ -233,51 +379,47 @@ class DatabaseManager:
                 return follow_ups
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération du suivi: {e}")
+            logger.error("Erreur lors de la récupération du suivi: %s", e)
             return []
     
     def get_statistics(self) -> Dict[str, Any]:
         """Récupère des statistiques globales"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Nombre total de patients
-                cursor = conn.execute('SELECT COUNT(*) as total FROM patients')
-                total_patients = cursor.fetchone()[0]
-                
-                # Nombre total d'analyses
-                cursor = conn.execute('SELECT COUNT(*) as total FROM analyses')
-                total_analyses = cursor.fetchone()[0]
-                
-                # Pathologies les plus courantes
+            with self._lock, self._conn as conn:
+                # Une seule requête : compteurs, pathologies les plus courantes et dernières analyses
                 cursor = conn.execute('''
-                    SELECT data->>'$.pathologie' as pathology, COUNT(*) as count 
-                    FROM patients 
-                    GROUP BY pathology 
-                    ORDER BY count DESC 
-                    LIMIT 5
-                ''')
-                common_pathologies = [{'pathology': row[0], 'count': row[1]} for row in cursor.fetchall()]
-                
-                # Dernières analyses
-                cursor = conn.execute('''
-                    SELECT a.created_at, p.data->>'$.pathologie' as pathology 
-                    FROM analyses a 
-                    JOIN patients p ON a.patient_id = p.id 
-                    ORDER BY a.created_at DESC 
-                    LIMIT 5
+                    WITH pathologies AS (
+                        SELECT json_extract(data, '$.pathologie') as pathology, COUNT(*) as count 
+                        FROM patients 
+                        GROUP BY pathology 
+                        ORDER BY count DESC 
+                        LIMIT 5
+                    ),
+                    recent AS (
+                        SELECT a.created_at as date, json_extract(p.data, '$.pathologie') as pathology 
+                        FROM analyses a 
+                        JOIN patients p ON a.patient_id = p.id 
+                        ORDER BY a.created_at DESC 
+                        LIMIT 5
+                    )
+                    SELECT json_object(
+                        'total_patients', (SELECT COUNT(*) FROM patients),
+                        'total_analyses', (SELECT COUNT(*) FROM analyses),
+                        'common_pathologies', json((
+                            SELECT json_group_array(json_object('pathology', pathology, 'count', count)) FROM pathologies
+                        )),
+                        'recent_analyses', json((
+                            SELECT json_group_array(json_object('date', date, 'pathology', pathology)) FROM recent
+                        ))
+                    )
                 ''')
-                recent_analyses = [{'date': row[0], 'pathology': row[1]} for row in cursor.fetchall()]
+                statistics = _loads_json(cursor.fetchone()[0])
                 
-                return {
-                    'total_patients': total_patients,
-                    'total_analyses': total_analyses,
-                    'common_pathologies': common_pathologies,
-                    'recent_analyses': recent_analyses,
-                    'database_size': f"{self._get_database_size()} MB"
-                }
+                statistics['database_size'] = f"{self._get_database_size()} MB"
+                return statistics
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération des statistiques: {e}")
+            logger.error("Erreur lors de la récupération des statistiques: %s", e)
             return {}
     
     def _get_database_size(self) -> float:
@@ -287,22 +429,21 @@ class DatabaseManager:
             return round(os.path.getsize(self.db_path) / (1024 * 1024), 2)
         return 0.0
     
-    def export_data(self, export_path: str):
-        """Exporte les données vers un fichier JSON"""
+    def export_data(self, export_path: str, limit: Optional[int] = 1000):
+        """Exporte les données vers un fichier JSON, patient par patient"""
         try:
-            data = {
-                'export_date': datetime.now().isoformat(),
-                'patients': self.get_all_patients(limit=1000),
-                'statistics': self.get_statistics()
-            }
-            
             with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(f'{{"export_date":{_dumps_json(datetime.now().isoformat())},"patients":[')
+                for i, patient in enumerate(self.iter_patients(limit=limit)):
+                    if i:
+                        f.write(',')
+                    f.write(_dumps_json(patient))
+                f.write(f'],"statistics":{_dumps_json(self.get_statistics())}}}')
             
-            logger.info(f"Données exportées vers: {export_path}")
+            logger.info("Données exportées vers: %s", export_path)
             
         except Exception as e:
-            logger.error(f"Erreur lors de l'export des données: {e}")
+            logger.error("Erreur lors de l'export des données: %s", e)
             raise
     
     def cleanup_old_data(self, days_old: int = 30):
@@ -310,7 +451,7 @@ class DatabaseManager:
         try:
             cutoff_date = datetime.now().timestamp() - (days_old * 24 * 60 * 60)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 # Supprimer les suivis anciens
                 conn.execute('DELETE FROM follow_ups WHERE created_at < ?', (cutoff_date,))
                 
@@ -318,7 +459,7 @@ class DatabaseManager:
                 conn.execute('DELETE FROM analyses WHERE patient_id NOT IN (SELECT id FROM patients)')
                 
                 conn.commit()
-                logger.info(f"Données de plus de {days_old} jours nettoyées")
+                logger.info("Données de plus de %s jours nettoyées", days_old)
                 
         except Exception as e:
-            logger.error(f"Erreur lors du nettoyage des données: {e}")
\ No newline at end of file
+            logger.error("Erreur lors du nettoyage des données: %s", e)
\ No newline at end of file
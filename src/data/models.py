@@ -1,5 +1,6 @@
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional
+import sys
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Iterable
 from datetime import datetime
 from enum import Enum
 
@@ -10,6 +11,10 @@ class HealthStatus(Enum):
     STABLE = "STABLE"
     EXCELLENT = "EXCELLENT"
 
+def _intern_terms(terms: Iterable[str]) -> Tuple[str, ...]:
+    """Fige une liste de termes médicaux en tuple de chaînes internées"""
+    return tuple(sys.intern(term) for term in terms)
+
 class TreatmentStatus(Enum):
     RECOMMENDED = "RECOMMANDÉ"
     PRESCRIBED = "PRESCRIT"
@@ -20,23 +25,43 @@ class TreatmentStatus(Enum):
 @dataclass
 class Patient:
     """Modèle de données pour un patient"""
+    __slots__ = (
+        'id', 'first_name', 'last_name', 'age', 'gender', 'pathology',
+        'symptoms', 'comorbidities', 'created_at', 'updated_at'
+    )
+    
     id: str
     first_name: str
     last_name: str
     age: int
     gender: str
     pathology: str
-    symptoms: List[str]
-    comorbidities: List[str]
+    symptoms: Tuple[str, ...]
+    comorbidities: Tuple[str, ...]
     created_at: str
     updated_at: str
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'id': self.id,
+            'first_name': self.first_name,
+            'last_name': self.last_name,
+            'age': self.age,
+            'gender': self.gender,
+            'pathology': self.pathology,
+            'symptoms': list(self.symptoms),
+            'comorbidities': list(self.comorbidities),
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Patient':
-        return cls(**data)
+        return cls(**{
+            **data,
+            'symptoms': _intern_terms(data['symptoms']),
+            'comorbidities': _intern_terms(data['comorbidities'])
+        })
 
 @dataclass
 class Treatment:
@@ -54,9 +79,19 @@ class Treatment:
     notes: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        data['status'] = self.status.value
-        return data
+        return {
+            'id': self.id,
+            'patient_id': self.patient_id,
+            'name': self.name,
+            'dosage': self.dosage,
+            'frequency': self.frequency,
+            'duration_days': self.duration_days,
+            'status': self.status.value,
+            'effectiveness_score': self.effectiveness_score,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'notes': self.notes
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Treatment':
@@ -66,6 +101,11 @@ class Treatment:
 @dataclass
 class Analysis:
     """Modèle de données pour une analyse médicale"""
+    __slots__ = (
+        'id', 'patient_id', 'pyramid_structure', 'health_metrics', 'predictions',
+        'recommendations', 'confidence_score', 'created_at'
+    )
+    
     id: str
     patient_id: str
     pyramid_structure: Dict[str, Any]
@@ -76,7 +116,16 @@ class Analysis:
     created_at: str
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'id': self.id,
+            'patient_id': self.patient_id,
+            'pyramid_structure': self.pyramid_structure,
+            'health_metrics': self.health_metrics,
+            'predictions': self.predictions,
+            'recommendations': self.recommendations,
+            'confidence_score': self.confidence_score,
+            'created_at': self.created_at
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Analysis':
@@ -85,6 +134,11 @@ class Analysis:
 @dataclass
 class FollowUp:
     """Modèle de données pour le suivi"""
+    __slots__ = (
+        'id', 'patient_id', 'day_number', 'health_status', 'symptoms',
+        'treatment_adherence', 'notes', 'created_at'
+    )
+    
     id: str
     patient_id: str
     day_number: int
@@ -95,9 +149,16 @@ class FollowUp:
     created_at: str
     
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        data['health_status'] = self.health_status.value
-        return data
+        return {
+            'id': self.id,
+            'patient_id': self.patient_id,
+            'day_number': self.day_number,
+            'health_status': self.health_status.value,
+            'symptoms': self.symptoms,
+            'treatment_adherence': self.treatment_adherence,
+            'notes': self.notes,
+            'created_at': self.created_at
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'FollowUp':
@@ -107,6 +168,8 @@ class FollowUp:
 @dataclass
 class MedicalHistory:
     """Historique médical complet d'un patient"""
+    __slots__ = ('patient', 'analyses', 'treatments', 'follow_ups')
+    
     patient: Patient
     analyses: List[Analysis]
     treatments: List[Treatment]
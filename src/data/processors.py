@@ -1,12 +1,167 @@
+import bisect
 import json
+import math
+from itertools import chain
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from datetime import datetime
 import logging
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
 
 logger = logging.getLogger(__name__)
 
+_SYMPTOM_CATEGORIES = {
+    'respiratory': ('TOUX', 'DYSPNÉE', 'EXPECTORATION'),
+    'fever': ('FIÈVRE', 'FIÈVRE_ÉLEVÉE', 'FIÈVRE_LEGERE'),
+    'pain': ('DOULEURS_MUSCULAIRES', 'CEPHALÉE', 'DOULEUR_THORACIQUE'),
+    'general': ('FATIGUE', 'ANOSMIE', 'NAUSÉE')
+}
+
+_SYMPTOM_TO_CATEGORY = {
+    symptom: category
+    for category, category_symptoms in _SYMPTOM_CATEGORIES.items()
+    for symptom in category_symptoms
+}
+
+_SEVERITY_WEIGHTS = {
+    'FIÈVRE_LEGERE': 0.3,
+    'TOUX': 0.3,
+    'FATIGUE': 0.2,
+    'FIÈVRE': 0.5,
+    'DYSPNÉE': 0.7,
+    'FIÈVRE_ÉLEVÉE': 0.8,
+    'DYSPNÉE_SEVERE': 0.9,
+    'DOULEUR_THORACIQUE': 0.8
+}
+
+# Table de sévérité indexée par identifiant de symptôme ; le dernier indice sert aux symptômes inconnus
+_SYMPTOM_ID = {symptom: i for i, symptom in enumerate(_SEVERITY_WEIGHTS)}
+_UNKNOWN_SYMPTOM_ID = len(_SYMPTOM_ID)
+_SEVERITY_ARR = np.array([*_SEVERITY_WEIGHTS.values(), 0.3], dtype=np.float64)
+
+_SEVERE_SYMPTOMS = frozenset({'DYSPNÉE_SEVERE', 'FIÈVRE_ÉLEVÉE', 'DOULEUR_THORACIQUE'})
+
+# Bornes incluses à gauche (âge <= 25 -> JEUNE, <= 60 -> ADULTE)
+_AGE_BOUNDS = (25, 60)
+_AGE_LABELS = ('JEUNE', 'ADULTE', 'SENIOR')
+
+# Seuils atteints à partir de la borne (score >= 0.4 -> MODÉRÉ, >= 0.7 -> ÉLEVÉ)
+_RISK_BOUNDS = (0.4, 0.7)
+_RISK_LABELS = ('FAIBLE', 'MODÉRÉ', 'ÉLEVÉ')
+
+# Au-delà de cette taille, NumPy devient plus rapide que les boucles Python
+_NUMPY_MIN_SIZE = 64
+
+# Taille de base à partir de laquelle la détection d'harmonie passe par np.diff / np.ptp
+_HARMONY_NUMPY_MIN_SIZE = 16
+
+# Plus grand entier représenté exactement en float64
+_MAX_EXACT_INT = 2 ** 53
+
+if _HAS_NUMBA:
+    # Signature explicite : compilé (ou relu depuis le cache) dès l'import, hors latence des requêtes
+    @njit('float64(float64[::1])', cache=True, fastmath=True)
+    def _entropy_kernel(values):
+        """Entropie de Shannon des valeurs normalisées, sans tableau intermédiaire"""
+        total = 0.0
+        for x in values:
+            total += x
+        entropy = 0.0
+        if total != 0:
+            for x in values:
+                p = x / total
+                if p > 0:
+                    entropy -= p * np.log(p)
+        return entropy
+
+@lru_cache(maxsize=256)
+def _upper(symptom: str) -> str:
+    """Met un symptôme en majuscules (vocabulaire restreint, donc mémorisé)"""
+    return symptom.upper()
+
+def _flatten_levels(levels: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatène les niveaux dans un tableau contigu, avec l'offset de début de chaque niveau"""
+    offsets = np.zeros(len(levels) + 1, dtype=np.intp)
+    np.cumsum(np.fromiter(map(len, levels), dtype=np.intp, count=len(levels)), out=offsets[1:])
+    flat = np.fromiter(chain.from_iterable(levels), dtype=np.float64, count=int(offsets[-1]))
+    return flat, offsets
+
+def _mean_std(values: Sequence[float], total: Optional[float] = None) -> Tuple[float, float]:
+    """Moyenne et écart-type (population) d'une petite séquence, sans tableau NumPy"""
+    n = len(values)
+    mean = (sum(values) if total is None else total) / n
+    variance = sum((value - mean) * (value - mean) for value in values) / n
+    return mean, math.sqrt(variance)
+
+@lru_cache(maxsize=4096)
+def _base_harmony(base: Tuple[int, ...]) -> float:
+    """Harmonie d'une base (mémorisée : les mêmes bases reviennent souvent dans un lot)"""
+    if len(base) < 2:
+        return 0.5
+    
+    if len(base) >= _HARMONY_NUMPY_MIN_SIZE:
+        values = np.asarray(base)
+        # Chemin NumPy réservé aux valeurs exactes en float64 (sinon débordement ou perte de précision)
+        exact = values.dtype == np.float64 or (
+            values.dtype == np.int64 and -_MAX_EXACT_INT <= values.min() and values.max() <= _MAX_EXACT_INT
+        )
+        if exact:
+            if np.ptp(np.diff(values)) == 0:
+                return 0.9  # Progression arithmétique parfaite
+            
+            values = values.astype(np.float64, copy=False)
+            previous = values[:-1]
+            nonzero = previous != 0
+            # round() Python et non np.round, qui diverge sur les cas x.x5
+            ratios = {round(ratio, 1) for ratio in (values[1:][nonzero] / previous[nonzero]).tolist()}
+            if len(ratios) == 1:
+                return 0.8  # Progression géométrique
+            
+            return 0.5  # Aucun pattern détecté
+    
+    # Vérifier les progressions arithmétiques ou géométriques
+    step = base[1] - base[0]
+    for i in range(2, len(base)):
+        if base[i] - base[i-1] != step:
+            break
+    else:
+        return 0.9  # Progression arithmétique parfaite
+    
+    ratios = {round(base[i] / base[i-1], 1) for i in range(1, len(base)) if base[i-1] != 0}
+    if len(ratios) == 1:
+        return 0.8  # Progression géométrique
+    
+    return 0.5  # Aucun pattern détecté
+
+# Début d'une charge patient écrite par orjson (json.dumps sépare par ': ')
+_ORJSON_STORAGE_PREFIX = '{"metadata":{'
+
+def _has_non_finite(obj: Any) -> bool:
+    """Indique si une structure JSON contient un flottant non fini (NaN, inf)"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
 class DataProcessor:
     """
     Processeur de données médicales
@@ -18,19 +173,79 @@ class DataProcessor:
     def process_patient_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """Traite les données brutes d'un patient"""
         try:
+            now = datetime.now()
+            symptoms = raw_data.get('symptomes', [])
+            severity_indicators = self._extract_severity_indicators(symptoms)
             processed = {
-                'id': raw_data.get('id', f"PAT_{datetime.now().strftime('%Y%m%d%H%M%S')}"),
+                'id': raw_data['id'] if 'id' in raw_data else f"PAT_{now.strftime('%Y%m%d%H%M%S')}",
                 'demographics': self._extract_demographics(raw_data),
-                'medical_info': self._extract_medical_info(raw_data),
-                'symptoms': self._process_symptoms(raw_data.get('symptomes', [])),
-                'risk_factors': self._assess_risk_factors(raw_data),
-                'processed_at': datetime.now().isoformat()
+                'medical_info': self._extract_medical_info(raw_data, severity_indicators),
+                'symptoms': self._process_symptoms(symptoms),
+                'risk_factors': self._assess_risk_factors(raw_data, severity_indicators),
+                'processed_at': now.isoformat()
             }
             
             return processed
             
         except Exception as e:
-            logger.error(f"Erreur lors du traitement des données patient: {e}")
+            logger.error("Erreur lors du traitement des données patient: %s", e)
+            raise
+    
+    def process_patients_batch(self, raw_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Traite un lot de patients, avec une évaluation des risques vectorisée"""
+        try:
+            now = datetime.now()
+            default_id = f"PAT_{now.strftime('%Y%m%d%H%M%S')}"
+            processed_at = now.isoformat()
+            n = len(raw_list)
+            
+            profils = [raw_data.get('profil', {}) for raw_data in raw_list]
+            ages = np.fromiter((p.get('age', 0) for p in profils), dtype=np.float64, count=n)
+            comorbidities = np.fromiter((p.get('comorbidities', 0) for p in profils), dtype=np.float64, count=n)
+            immunity = np.fromiter((p.get('immunity_level', 0.7) for p in profils), dtype=np.float64, count=n)
+            severity_indicators = [
+                self._extract_severity_indicators(raw_data.get('symptomes', [])) for raw_data in raw_list
+            ]
+            severe = np.fromiter(map(bool, severity_indicators), dtype=bool, count=n)
+            
+            # Mêmes règles et même ordre d'addition que _assess_risk_factors
+            age_conditions = [ages >= 65, ages <= 12]
+            comorbidity_conditions = [comorbidities >= 3, comorbidities >= 1]
+            low_immunity = immunity <= 0.4
+            scores = (
+                np.select(age_conditions, [0.3, 0.2], 0.0)
+                + np.select(comorbidity_conditions, [0.4, 0.2], 0.0)
+                + np.where(low_immunity, 0.3, 0.0)
+                + np.where(severe, 0.3, 0.0)
+            )
+            
+            factor_columns = (
+                np.select(age_conditions, ["Âge avancé", "Âge pédiatrique"], ""),
+                np.select(comorbidity_conditions, ["Multiples comorbidités", "Comorbidités présentes"], ""),
+                np.where(low_immunity, "Immunodépression", ""),
+                np.where(severe, "Symptômes sévères présents", "")
+            )
+            
+            results = []
+            rows = zip(raw_list, severity_indicators, scores.tolist(), zip(*(c.tolist() for c in factor_columns)))
+            for raw_data, indicators, score, factors in rows:
+                results.append({
+                    'id': raw_data['id'] if 'id' in raw_data else default_id,
+                    'demographics': self._extract_demographics(raw_data),
+                    'medical_info': self._extract_medical_info(raw_data, indicators),
+                    'symptoms': self._process_symptoms(raw_data.get('symptomes', [])),
+                    'risk_factors': {
+                        'factors': [factor for factor in factors if factor],
+                        'score': min(score, 1.0),
+                        'level': self._get_risk_level(score)
+                    },
+                    'processed_at': processed_at
+                })
+            
+            return results
+            
+        except Exception as e:
+            logger.error("Erreur lors du traitement du lot de patients: %s", e)
             raise
     
     def _extract_demographics(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -45,48 +260,35 @@ class DataProcessor:
     
     def _get_age_group(self, age: int) -> str:
         """Détermine le groupe d'âge"""
-        if age <= 25:
-            return 'JEUNE'
-        elif age <= 60:
-            return 'ADULTE'
-        else:
-            return 'SENIOR'
+        return _AGE_LABELS[bisect.bisect_left(_AGE_BOUNDS, age)]
     
-    def _extract_medical_info(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Extrait les informations médicales"""
+    def _extract_medical_info(self, data: Dict[str, Any],
+                              severity_indicators: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Extrait les informations médicales (indicateurs de sévérité réutilisés si fournis)"""
+        symptoms = data.get('symptomes', [])
+        if severity_indicators is None:
+            severity_indicators = self._extract_severity_indicators(symptoms)
         return {
             'pathology': data.get('pathologie', ''),
-            'symptom_count': len(data.get('symptomes', [])),
-            'severity_indicators': self._extract_severity_indicators(data.get('symptomes', []))
+            'symptom_count': len(symptoms),
+            'severity_indicators': severity_indicators
         }
     
     def _extract_severity_indicators(self, symptoms: List[str]) -> List[str]:
         """Extrait les indicateurs de sévérité"""
-        severe_indicators = []
-        severe_symptoms = {'DYSPNÉE_SEVERE', 'FIÈVRE_ÉLEVÉE', 'DOULEUR_THORACIQUE'}
-        
-        for symptom in symptoms:
-            if symptom in severe_symptoms:
-                severe_indicators.append(symptom)
-        
-        return severe_indicators
+        # Cas le plus fréquent (aucun symptôme sévère) : parcours entièrement en C
+        if _SEVERE_SYMPTOMS.isdisjoint(symptoms):
+            return []
+        return [symptom for symptom in symptoms if symptom in _SEVERE_SYMPTOMS]
     
     def _process_symptoms(self, symptoms: List[str]) -> Dict[str, Any]:
         """Traite la liste des symptômes"""
-        symptom_categories = {
-            'respiratory': ['TOUX', 'DYSPNÉE', 'EXPECTORATION'],
-            'fever': ['FIÈVRE', 'FIÈVRE_ÉLEVÉE', 'FIÈVRE_LEGERE'],
-            'pain': ['DOULEURS_MUSCULAIRES', 'CEPHALÉE', 'DOULEUR_THORACIQUE'],
-            'general': ['FATIGUE', 'ANOSMIE', 'NAUSÉE']
-        }
-        
-        categorized = {category: [] for category in symptom_categories.keys()}
+        categorized = {category: [] for category in _SYMPTOM_CATEGORIES}
         
         for symptom in symptoms:
-            for category, category_symptoms in symptom_categories.items():
-                if symptom in category_symptoms:
-                    categorized[category].append(symptom)
-                    break
+            category = _SYMPTOM_TO_CATEGORY.get(symptom)
+            if category is not None:
+                categorized[category].append(symptom)
         
         return {
             'all_symptoms': symptoms,
@@ -100,32 +302,26 @@ class DataProcessor:
         if not symptoms:
             return 0.0
         
-        categories_represented = sum(1 for category_symptoms in self._process_symptoms(symptoms)['categorized_symptoms'].values() if category_symptoms)
-        total_categories = 4  # respiratory, fever, pain, general
+        categories_represented = {_SYMPTOM_TO_CATEGORY[s] for s in symptoms if s in _SYMPTOM_TO_CATEGORY}
+        total_categories = len(_SYMPTOM_CATEGORIES)  # respiratory, fever, pain, general
         
-        return categories_represented / total_categories
+        return len(categories_represented) / total_categories
     
     def _calculate_symptom_severity(self, symptoms: List[str]) -> float:
         """Calcule le score de sévérité des symptômes"""
-        severity_weights = {
-            'FIÈVRE_LEGERE': 0.3,
-            'TOUX': 0.3,
-            'FATIGUE': 0.2,
-            'FIÈVRE': 0.5,
-            'DYSPNÉE': 0.7,
-            'FIÈVRE_ÉLEVÉE': 0.8,
-            'DYSPNÉE_SEVERE': 0.9,
-            'DOULEUR_THORACIQUE': 0.8
-        }
-        
         if not symptoms:
             return 0.0
         
-        total_severity = sum(severity_weights.get(symptom, 0.3) for symptom in symptoms)
-        return min(total_severity / len(symptoms), 1.0)
+        ids = np.fromiter(
+            (_SYMPTOM_ID.get(symptom, _UNKNOWN_SYMPTOM_ID) for symptom in symptoms),
+            dtype=np.int32,
+            count=len(symptoms)
+        )
+        return min(float(_SEVERITY_ARR[ids].mean()), 1.0)
     
-    def _assess_risk_factors(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Évalue les facteurs de risque"""
+    def _assess_risk_factors(self, data: Dict[str, Any],
+                             severity_indicators: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Évalue les facteurs de risque (indicateurs de sévérité réutilisés si fournis)"""
         profil = data.get('profil', {})
         age = profil.get('age', 0)
         comorbidities = profil.get('comorbidities', 0)
@@ -156,8 +352,9 @@ class DataProcessor:
             risk_score += 0.3
         
         # Symptômes sévères
-        severe_symptoms = self._extract_severity_indicators(data.get('symptomes', []))
-        if severe_symptoms:
+        if severity_indicators is None:
+            severity_indicators = self._extract_severity_indicators(data.get('symptomes', []))
+        if severity_indicators:
             risk_factors.append("Symptômes sévères présents")
             risk_score += 0.3
         
@@ -169,12 +366,7 @@ class DataProcessor:
     
     def _get_risk_level(self, score: float) -> str:
         """Détermine le niveau de risque"""
-        if score >= 0.7:
-            return "ÉLEVÉ"
-        elif score >= 0.4:
-            return "MODÉRÉ"
-        else:
-            return "FAIBLE"
+        return _RISK_LABELS[bisect.bisect_right(_RISK_BOUNDS, score)]
     
     def process_pyramid_data(self, pyramid_structure: Dict[str, Any]) -> Dict[str, Any]:
         """Traite les données de la pyramide"""
@@ -182,17 +374,18 @@ class DataProcessor:
             base = pyramid_structure.get('base', [])
             upper = pyramid_structure.get('superieure', [])
             lower = pyramid_structure.get('inferieure', [])
+            structural_metrics = self._calculate_structural_metrics(base, upper, lower)
             
             return {
                 'base_metrics': self._analyze_base(base),
                 'upper_metrics': self._analyze_levels(upper, "upper"),
                 'lower_metrics': self._analyze_levels(lower, "lower"),
-                'structural_metrics': self._calculate_structural_metrics(pyramid_structure),
-                'harmony_score': self._calculate_harmony_score(pyramid_structure)
+                'structural_metrics': structural_metrics,
+                'harmony_score': self._calculate_harmony_score(base, upper, lower, structural_metrics)
             }
             
         except Exception as e:
-            logger.error(f"Erreur lors du traitement des données pyramidales: {e}")
+            logger.error("Erreur lors du traitement des données pyramidales: %s", e)
             raise
     
     def _analyze_base(self, base: List[int]) -> Dict[str, Any]:
@@ -200,30 +393,34 @@ class DataProcessor:
         if not base:
             return {}
         
+        total = sum(base)
+        mean, std = _mean_std(base, total)
+        
         return {
             'length': len(base),
-            'mean': float(np.mean(base)),
-            'std': float(np.std(base)),
+            'mean': float(mean),
+            'std': float(std),
             'min': min(base),
             'max': max(base),
-            'sum': sum(base),
+            'sum': total,
             'entropy': self._calculate_entropy(base)
         }
     
     def _analyze_levels(self, levels: List[List[int]], level_type: str) -> Dict[str, Any]:
-        """Analyse les niveaux de la pyramide"""
+        """Analyse les niveaux de la pyramide, aplatis une seule fois en tableau contigu"""
         if not levels:
             return {}
         
-        all_values = [value for level in levels for value in level]
+        flat, offsets = _flatten_levels(levels)
+        overall_mean, overall_std = (float(flat.mean()), float(flat.std())) if flat.size else (0, 0)
         
         return {
             'level_count': len(levels),
-            'total_values': len(all_values),
-            'mean_values_per_level': len(all_values) / len(levels) if levels else 0,
-            'overall_mean': float(np.mean(all_values)) if all_values else 0,
-            'overall_std': float(np.std(all_values)) if all_values else 0,
-            'convergence_speed': self._calculate_convergence_speed(levels, level_type)
+            'total_values': flat.size,
+            'mean_values_per_level': flat.size / len(levels),
+            'overall_mean': overall_mean,
+            'overall_std': overall_std,
+            'convergence_speed': self._calculate_convergence_speed(levels, level_type, flat, offsets)
         }
     
     def _calculate_entropy(self, sequence: List[int]) -> float:
@@ -231,6 +428,17 @@ class DataProcessor:
         if not sequence:
             return 0.0
         
+        if _HAS_NUMBA:
+            return float(_entropy_kernel(np.ascontiguousarray(sequence, dtype=np.float64)))
+        
+        if len(sequence) <= _NUMPY_MIN_SIZE:
+            total = float(sum(sequence))
+            if total == 0:
+                return 0.0
+            
+            probabilities = [value / total for value in sequence]
+            return float(-sum(p * math.log(p) for p in probabilities if p > 0))
+        
         # Normaliser la séquence
         seq_array = np.array(sequence, dtype=float)
         if np.sum(seq_array) == 0:
@@ -241,29 +449,39 @@ class DataProcessor:
         
         return float(-np.sum(probabilities * np.log(probabilities)))
     
-    def _calculate_convergence_speed(self, levels: List[List[int]], level_type: str) -> float:
-        """Calcule la vitesse de convergence"""
+    def _calculate_convergence_speed(self, levels: List[List[int]], level_type: str,
+                                     flat: Optional[np.ndarray] = None,
+                                     offsets: Optional[np.ndarray] = None) -> float:
+        """Calcule la vitesse de convergence (à partir des niveaux aplatis si fournis)"""
         if not levels:
             return 0.0
         
+        if flat is None or offsets is None:
+            flat, offsets = _flatten_levels(levels)
+        
         if level_type == "upper":
             # Pour la partie supérieure, on regarde comment les valeurs augmentent
-            level_sizes = [len(level) for level in levels]
-            return 1.0 - (min(level_sizes) / max(level_sizes)) if max(level_sizes) > 0 else 0.0
+            sizes = np.diff(offsets)
+            largest = int(sizes.max())
+            return 1.0 - (int(sizes.min()) / largest) if largest > 0 else 0.0
         else:
             # Pour la partie inférieure, on regarde comment les valeurs convergent
-            final_level = levels[-1]
-            if len(final_level) == 1:
+            final_level = flat[offsets[-2]:]
+            if final_level.size == 1:
                 return 1.0  # Convergence parfaite
+            elif not final_level.size:
+                return 0
             else:
-                variation = np.std(final_level) / (np.mean(final_level) if np.mean(final_level) != 0 else 1)
+                mean = float(final_level.mean())
+                variation = float(final_level.std()) / (mean if mean != 0 else 1)
                 return max(0, 1 - variation)
     
-    def _calculate_structural_metrics(self, pyramid: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_structural_metrics(self, base: List[int], upper: List[List[int]],
+                                      lower: List[List[int]]) -> Dict[str, Any]:
         """Calcule les métriques structurelles"""
-        upper_levels = len(pyramid.get('superieure', []))
-        lower_levels = len(pyramid.get('inferieure', []))
-        base_length = len(pyramid.get('base', []))
+        upper_levels = len(upper)
+        lower_levels = len(lower)
+        base_length = len(base)
         
         symmetry = 1.0 - (abs(upper_levels - lower_levels) / max(upper_levels, lower_levels, 1))
         balance = upper_levels / (upper_levels + lower_levels) if (upper_levels + lower_levels) > 0 else 0.5
@@ -275,39 +493,26 @@ class DataProcessor:
             'structure_complexity': (upper_levels + lower_levels) / base_length if base_length > 0 else 0
         }
     
-    def _calculate_harmony_score(self, pyramid: Dict[str, Any]) -> float:
-        """Calcule le score d'harmonie global"""
-        structural_metrics = self._calculate_structural_metrics(pyramid)
+    def _calculate_harmony_score(self, base: List[int], upper: List[List[int]], lower: List[List[int]],
+                                 structural_metrics: Optional[Dict[str, Any]] = None) -> float:
+        """Calcule le score d'harmonie global (métriques structurelles recalculées si absentes)"""
+        if structural_metrics is None:
+            structural_metrics = self._calculate_structural_metrics(base, upper, lower)
         
         scores = [
             structural_metrics['symmetry_score'],
-            self._calculate_base_harmony(pyramid.get('base', [])),
-            self._calculate_level_harmony(pyramid)
+            self._calculate_base_harmony(base),
+            self._calculate_level_harmony(upper, lower)
         ]
         
         return float(np.mean([s for s in scores if s is not None]))
     
     def _calculate_base_harmony(self, base: List[int]) -> float:
         """Calcule l'harmonie de la base"""
-        if len(base) < 2:
-            return 0.5
-        
-        # Vérifier les progressions arithmétiques ou géométriques
-        differences = [base[i] - base[i-1] for i in range(1, len(base))]
-        if len(set(differences)) == 1:
-            return 0.9  # Progression arithmétique parfaite
-        
-        ratios = [base[i] / base[i-1] for i in range(1, len(base)) if base[i-1] != 0]
-        if ratios and len(set(round(r, 1) for r in ratios)) == 1:
-            return 0.8  # Progression géométrique
-        
-        return 0.5  # Aucun pattern détecté
+        return _base_harmony(tuple(base))
     
-    def _calculate_level_harmony(self, pyramid: Dict[str, Any]) -> float:
+    def _calculate_level_harmony(self, upper: List[List[int]], lower: List[List[int]]) -> float:
         """Calcule l'harmonie entre les niveaux"""
-        upper = pyramid.get('superieure', [])
-        lower = pyramid.get('inferieure', [])
-        
         if not upper or not lower:
             return 0.5
         
@@ -331,46 +536,59 @@ class MedicalDataEncoder:
     def encode_patient_for_storage(patient_data: Dict[str, Any]) -> str:
         """Encode les données patient pour le stockage"""
         try:
+            now_iso = datetime.now().isoformat()
+            
             # Nettoyer et structurer les données
             encoded = {
                 'metadata': {
                     'version': '1.0',
-                    'encoded_at': datetime.now().isoformat(),
+                    'encoded_at': now_iso,
                     'data_type': 'patient'
                 },
-                'patient': MedicalDataEncoder._clean_patient_data(patient_data)
+                'patient': MedicalDataEncoder._clean_patient_data(patient_data, now_iso)
             }
             
+            # orjson écrit NaN/inf en null : json (NaN, Infinity) pour préserver ces valeurs
+            if orjson is not None and not _has_non_finite(encoded):
+                try:
+                    return orjson.dumps(encoded, option=orjson.OPT_NON_STR_KEYS).decode()
+                except orjson.JSONEncodeError:
+                    pass  # Entiers au-delà de 64 bits, types non pris en charge : repli sur json
             return json.dumps(encoded, ensure_ascii=False)
             
         except Exception as e:
-            logger.error(f"Erreur lors de l'encodage des données patient: {e}")
+            logger.error("Erreur lors de l'encodage des données patient: %s", e)
             raise
     
     @staticmethod
     def decode_patient_from_storage(encoded_data: str) -> Dict[str, Any]:
         """Décode les données patient depuis le stockage"""
         try:
-            data = json.loads(encoded_data)
+            # Seules les charges écrites par orjson (compactes) sont relues par orjson : celles
+            # écrites par json peuvent contenir NaN, Infinity ou des entiers au-delà de 64 bits
+            if orjson is not None and encoded_data.startswith(_ORJSON_STORAGE_PREFIX):
+                data = orjson.loads(encoded_data)
+            else:
+                data = json.loads(encoded_data)
             return data.get('patient', {})
         except Exception as e:
-            logger.error(f"Erreur lors du décodage des données patient: {e}")
+            logger.error("Erreur lors du décodage des données patient: %s", e)
             return {}
     
     @staticmethod
-    def _clean_patient_data(data: Dict[str, Any]) -> Dict[str, Any]:
-        """Nettoie et structure les données patient"""
-        cleaned = data.copy()
+    def _clean_patient_data(data: Dict[str, Any], processed_at: Optional[str] = None) -> Dict[str, Any]:
+        """Nettoie et structure les données patient (horodatées à processed_at, ou maintenant)"""
+        cleaned = {key: value for key, value in data.items() if key != 'profil' and key != 'symptomes'}
         
         # Standardiser les champs
-        if 'profil' in cleaned:
-            cleaned['profile'] = cleaned.pop('profil')
+        if 'profil' in data:
+            cleaned['profile'] = data['profil']
         
-        if 'symptomes' in cleaned:
-            cleaned['symptoms'] = [s.upper() for s in cleaned.pop('symptomes')]
+        if 'symptomes' in data:
+            cleaned['symptoms'] = list(map(_upper, data['symptomes']))
         
         # Ajouter des métadonnées
-        cleaned['processed_at'] = datetime.now().isoformat()
+        cleaned['processed_at'] = processed_at or datetime.now().isoformat()
         cleaned['data_version'] = '1.0'
         
         return cleaned
@@ -392,19 +610,25 @@ class MedicalDataEncoder:
             return encoded
             
         except Exception as e:
-            logger.error(f"Erreur lors de l'encodage pour l'API: {e}")
+            logger.error("Erreur lors de l'encodage pour l'API: %s", e)
             return {}
     
     @staticmethod
     def _extract_health_assessment(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extrait l'évaluation de santé"""
         condition = analysis_data.get('condition_actuelle', {})
+        # Accès direct à l'attribut ; None ou valeur déjà sérialisée -> INCONNU, comme avec getattr
+        try:
+            health_status = condition.get('etat_sante').label
+        except AttributeError:
+            health_status = 'INCONNU'
+        
         return {
             'severity_score': condition.get('score_gravite', 0.5),
             'recovery_potential': condition.get('potentiel_retablissement', 0.5),
             'resilience': condition.get('resilience_patient', 0.5),
             'biological_harmony': condition.get('harmonie_biologique', 0.5),
-            'health_status': getattr(condition.get('etat_sante'), 'label', 'INCONNU')
+            'health_status': health_status
         }
     
     @staticmethod
@@ -0,0 +1,19 @@
+import pytest
+import sys
+import os
+
+# Ajouter la racine du projet (paquet src) au chemin, une seule fois pour toute la suite
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.core.medical_predictions import AlgoVeriteMedical
+from src.data.processors import DataProcessor
+
+@pytest.fixture(scope="session")
+def algo():
+    """Algorithme médical partagé (tables de référence chargées une seule fois)"""
+    return AlgoVeriteMedical()
+
+@pytest.fixture(scope="session")
+def processor():
+    """Processeur de données partagé"""
+    return DataProcessor()
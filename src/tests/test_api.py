@@ -1,11 +1,6 @@
 import pytest
-import sys
-import os
 from fastapi.testclient import TestClient
 
-# Ajouter le chemin src
-sys.path.append(os.path.join(os.path.dirfile__, '..'))
-
 from src.api.routes import app
 
 client = TestClient(app)
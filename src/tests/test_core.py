@@ -1,9 +1,5 @@
 import pytest
-import sys
-import os
-
-# Ajouter le chemin src
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
 
 from src.core.algo_verite import AlgoVerite
 from src.core.medical_predictions import AlgoVeriteMedical
@@ -99,10 +95,10 @@ class TestAlgoVeriteMedical:
         
         condition = algo._analyser_condition_patient(patient_data)
         
-        assert 'score_gravite' in condition
-        assert 'resilience_patient' in condition
-        assert 'harmonie_biologique' in condition
-        assert 0 <= condition['score_gravite'] <= 1
+        assert hasattr(condition, 'score_gravite')
+        assert hasattr(condition, 'resilience_patient')
+        assert hasattr(condition, 'harmonie_biologique')
+        assert 0 <= condition.score_gravite <= 1
     
     def test_treatment_recommendation(self):
         """Test de la recommandation de traitements"""
@@ -117,9 +113,61 @@ class TestAlgoVeriteMedical:
         treatments = algo._rechercher_traitements_optimaux(patient_data, condition)
         
         assert len(treatments) > 0
-        assert 'nom' in treatments[0]
-        assert 'score_global' in treatments[0]
-        assert 0 <= treatments[0]['score_global'] <= 1
+        assert treatments[0].nom
+        assert 0 <= treatments[0].score_global <= 1
+    
+    def test_evolution_prediction(self):
+        """Test de l'évolution prédite stockée par colonnes"""
+        algo = AlgoVeriteMedical()
+        patient_data = {
+            'pathologie': 'PNEUMONIE',
+            'symptomes': ['FIÈVRE_ÉLEVÉE', 'DYSPNÉE'],
+            'profil': {'age': 70, 'comorbidities': 2}
+        }
+        analyse_sante = algo._analyser_condition_patient(patient_data)
+        
+        evolution = algo._predire_evolution(analyse_sante, 10)
+        
+        assert len(evolution) == 11
+        assert evolution.jours[0] == 0 and evolution.jours[-1] == 10
+        assert evolution.scores[0] == analyse_sante.score_gravite
+        assert len(evolution.actions) == 11
+        
+        jours = evolution.as_list_of_dicts()
+        assert jours[0]['jour'] == 0
+        assert jours[0]['etat'] == evolution.etats[0]
+        assert "Début du traitement" in jours[0]['actions_recommandees']
+    
+    def test_evolution_batch(self):
+        """Test de la prédiction d'évolution groupée pour une cohorte"""
+        algo = AlgoVeriteMedical()
+        
+        scores = algo._predire_evolution_batch(
+            np.array([0.8, 0.4]),
+            np.array([0.5, 0.9]),
+            np.array([5, 2])
+        )
+        
+        assert scores.shape == (2, 6)
+        assert scores[0, 0] == 0.8 and scores[1, 0] == 0.4
+        assert not np.isnan(scores[0]).any()
+        assert np.isnan(scores[1, 3:]).all()
+    
+    def test_preparation_cache(self):
+        """Test de la mémorisation de l'analyse de condition par contenu du patient"""
+        algo = AlgoVeriteMedical()
+        patient_data = {
+            'pathologie': 'GRIPPE',
+            'symptomes': ['FIÈVRE', 'TOUX'],
+            'profil': {'age': 30, 'comorbidities': 0}
+        }
+        
+        premier = algo.analyser_patient(patient_data)
+        second = algo.analyser_patient(dict(patient_data))
+        
+        assert len(algo.preparations_cache) == 1
+        assert premier['condition_actuelle'] == second['condition_actuelle']
+        assert premier['traitements_recommandes'] == second['traitements_recommandes']
 
 class TestPyramidAnalyzer:
     """Tests pour l'analyseur pyramidale"""
@@ -159,6 +207,29 @@ class TestPyramidAnalyzer:
         
         assert 'patterns' in result
         # Une séquence arithmétique devrait être détectée
+    
+    def test_cached_analysis_isolated(self):
+        """Test de l'isolation du cache : modifier un résultat n'altère pas les suivants"""
+        analyzer = PyramidAnalyzer()
+        
+        first = analyzer.analyze_pyramid_structure([1, 2, 3])
+        expected = repr(first)
+        first['pyramid']['base'].append(99)
+        first['metrics'] = None
+        
+        assert repr(analyzer.analyze_pyramid_structure([1, 2, 3])) == expected
+    
+    def test_classify_batch(self):
+        """Test de la classification par lot"""
+        analyzer = PyramidAnalyzer()
+        
+        indices = analyzer.classify_batch(np.array([0.95, 0.5, 0.85, 0.1]), np.array([0.95, 0.8, 0.5, 0.2]))
+        types = [analyzer.PYRAMID_TYPES[i].value for i in indices]
+        
+        assert types == ["PYRAMIDE_PARFAITE", "PYRAMIDE_STABLE", "PYRAMIDE_HARMONIEUSE", "PYRAMIDE_INSTABLE"]
+        assert list(analyzer.assess_compatibility_batch([0.95, 0.9, 0.6, 0.5])) == [
+            "COMPATIBILITÉ PARFAITE", "HAUTE COMPATIBILITÉ", "COMPATIBILITÉ MODÉRÉE", "FAIBLE COMPATIBILITÉ"
+        ]
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,189 @@
+import copy
+from datetime import datetime
+
+import pytest
+import numpy as np
+
+from src.utils.helpers import (
+    deep_merge,
+    validate_patient_data,
+    validate_patient_batch,
+    generate_hash,
+    hash_many,
+    normalize_value,
+    normalize_array,
+    timestamp,
+    format_duration,
+    format_durations,
+    calculate_age_group,
+    calculate_age_groups,
+    generate_hash_fast,
+    deep_merge_view,
+    generate_hash_bytes
+)
+
+_ERREUR_AGE = "L'âge doit être un nombre positif"
+_ERREUR_COMORBIDITES = "Le nombre de comorbidités ne peut pas être négatif"
+
+class TestValidation:
+    """Tests pour la validation des données patient"""
+    
+    def test_batch_matches_single_validation(self):
+        """Test de la validation par lot, identique à la validation unitaire"""
+        patients = [
+            {'pathologie': 'GRIPPE', 'symptomes': ['TOUX'], 'profil': {'age': 30, 'comorbidities': 0}},
+            {'pathologie': 'GRIPPE', 'symptomes': ['TOUX'], 'profil': {}},
+            {'pathologie': 'GRIPPE', 'symptomes': ['TOUX'], 'profil': {'age': 0, 'comorbidities': 0}},
+            {'pathologie': 'GRIPPE', 'symptomes': ['TOUX'], 'profil': {'age': -5, 'comorbidities': -1}},
+            {'pathologie': 'GRIPPE', 'symptomes': ['TOUX'], 'profil': {'age': 0.5, 'comorbidities': 2}},
+            {'pathologie': '', 'symptomes': []},
+            {}
+        ]
+        
+        assert validate_patient_batch(patients) == [validate_patient_data(p) for p in patients]
+    
+    @pytest.mark.parametrize("profil,expected", [
+        ({'age': 30, 'comorbidities': None}, [_ERREUR_COMORBIDITES]),
+        ({'age': '30', 'comorbidities': 0}, [_ERREUR_AGE]),
+        ({'age': None, 'comorbidities': '1'}, [_ERREUR_AGE, _ERREUR_COMORBIDITES])
+    ])
+    def test_batch_rejects_non_numeric_fields(self, profil, expected):
+        """Test du rejet des champs non numériques, que la validation unitaire refuse aussi"""
+        patient = {'pathologie': 'GRIPPE', 'symptomes': ['TOUX'], 'profil': profil}
+        
+        with pytest.raises(TypeError):
+            validate_patient_data(patient)
+        
+        assert validate_patient_batch([patient]) == [expected]
+    
+    def test_batch_rejects_nan(self):
+        """Test du rejet des valeurs NaN"""
+        patient = {'pathologie': 'GRIPPE', 'symptomes': ['TOUX'], 'profil': {'age': float('nan'), 'comorbidities': float('nan')}}
+        
+        assert validate_patient_batch([patient]) == [[_ERREUR_AGE, _ERREUR_COMORBIDITES]]
+
+class TestDeepMerge:
+    """Tests pour la fusion de dictionnaires"""
+    
+    def test_nested_overlap(self):
+        """Test de la fusion récursive des sous-dictionnaires communs"""
+        dict1 = {'a': 1, 'profil': {'age': 30, 'facteurs': {'tabac': True}}}
+        dict2 = {'b': 2, 'profil': {'comorbidities': 1, 'facteurs': {'sport': False}}}
+        
+        assert deep_merge(dict1, dict2) == {
+            'a': 1,
+            'b': 2,
+            'profil': {'age': 30, 'comorbidities': 1, 'facteurs': {'tabac': True, 'sport': False}}
+        }
+    
+    def test_replacement_between_dict_and_value(self):
+        """Test du remplacement d'un dictionnaire par une valeur et inversement"""
+        assert deep_merge({'x': {'y': 1}}, {'x': 5}) == {'x': 5}
+        assert deep_merge({'x': 5}, {'x': {'y': 1}}) == {'x': {'y': 1}}
+    
+    def test_empty_second_dict(self):
+        """Test de la fusion avec un dictionnaire vide"""
+        dict1 = {'a': {'b': 1}}
+        
+        result = deep_merge(dict1, {})
+        
+        assert result == dict1
+        assert result is not dict1
+    
+    def test_inputs_unmodified(self):
+        """Test de la non-modification des dictionnaires d'entrée"""
+        dict1 = {'a': {'b': 1, 'c': {'d': 2}}, 'e': [1]}
+        dict2 = {'a': {'c': {'d': 3, 'f': 4}}, 'e': [2]}
+        originals = copy.deepcopy((dict1, dict2))
+        
+        deep_merge(dict1, dict2)
+        
+        assert (dict1, dict2) == originals
+    
+    def test_deep_merge_view_matches_deep_merge(self):
+        """Test de la fusion en lecture seule, au contenu identique à deep_merge"""
+        dict1 = {'a': 1, 'profil': {'age': 30}}
+        cases = [{}, {'b': 2}, {'a': 3}, {'profil': {'comorbidities': 1}}, {'profil': 5}]
+        
+        for dict2 in cases:
+            assert dict(deep_merge_view(dict1, dict2)) == deep_merge(dict1, dict2)
+        
+        assert deep_merge_view(dict1, {}) is dict1
+        assert dict1 == {'a': 1, 'profil': {'age': 30}}
+
+class TestHashing:
+    """Tests pour les fonctions de hash"""
+    
+    def test_hash_many_matches_generate_hash(self):
+        """Test du hash par lot, identique au hash unitaire"""
+        items = ['', 'GRIPPE', 'FIÈVRE_ÉLEVÉE', 'PAT_001']
+        
+        assert hash_many(items) == [generate_hash(item) for item in items]
+        assert hash_many(iter(items)) == hash_many(items)
+    
+    def test_generate_hash_fast(self):
+        """Test du hash rapide : 128 bits, déterministe et discriminant"""
+        digest = generate_hash_fast('GRIPPE')
+        
+        assert len(digest) == 32
+        assert set(digest) <= set('0123456789abcdef')
+        assert generate_hash_fast('GRIPPE') == digest
+        assert generate_hash_fast('COVID') != digest
+    
+    def test_generate_hash_bytes(self):
+        """Test du hash brut et du hash de bytes, cohérents avec le hexdigest SHA-256"""
+        data = 'FIÈVRE_ÉLEVÉE'
+        
+        assert generate_hash_bytes(data).hex() == generate_hash(data)
+        assert generate_hash_bytes(data.encode()) == generate_hash_bytes(data)
+        assert generate_hash(data.encode()) == generate_hash(data)
+        assert generate_hash('') == 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
+
+class TestNormalization:
+    """Tests pour la normalisation des valeurs"""
+    
+    def test_normalize_array_matches_normalize_value(self):
+        """Test de la normalisation vectorisée, identique à la normalisation unitaire"""
+        values = [0, 2.5, 10, -5, 15]
+        
+        assert normalize_array(values, 0, 10).tolist() == [normalize_value(v, 0, 10) for v in values]
+        assert normalize_array(values, 3, 3).tolist() == [0.5] * len(values)
+        assert normalize_array(values, 0, 10, dtype=np.float32).dtype == np.float32
+
+class TestTimestamp:
+    """Tests pour l'horodatage"""
+    
+    def test_timestamp_isoformat(self):
+        """Test du format identique à datetime.now().isoformat()"""
+        before = datetime.now()
+        stamps = [timestamp() for _ in range(1000)]
+        after = datetime.now()
+        
+        parsed = [datetime.fromisoformat(stamp) for stamp in stamps]
+        
+        assert [value.isoformat() for value in parsed] == stamps
+        assert before.replace(microsecond=0) <= parsed[0] and parsed[-1] <= after
+        assert parsed == sorted(parsed)
+
+class TestFormatting:
+    """Tests pour le formatage des durées et groupes d'âge"""
+    
+    @pytest.mark.parametrize("days", range(-2, 401))
+    def test_format_durations_matches_format_duration(self, days):
+        """Test du formatage par lot, identique au formatage unitaire"""
+        assert format_durations([days]) == [format_duration(days)]
+    
+    def test_format_durations_batch(self):
+        """Test du formatage d'un lot complet en une passe"""
+        days = list(range(-2, 401))
+        
+        assert format_durations(days) == [format_duration(d) for d in days]
+    
+    def test_calculate_age_groups_matches_calculate_age_group(self):
+        """Test des groupes d'âge par lot, identiques au calcul unitaire (âges fractionnaires et NaN compris)"""
+        ages = [0, 5, 17.9, 18, 30, 64.9, 65, 90, float('nan')]
+        
+        assert calculate_age_groups(ages).tolist() == [calculate_age_group(age) for age in ages]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
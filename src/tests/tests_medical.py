@@ -1,21 +1,11 @@
 import pytest
-import sys
-import os
 
-# Ajouter le chemin src
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-
-from src.core.medical_predictions import AlgoVeriteMedical
-from src.data.processors import DataProcessor
+from src.data.processors import MedicalDataEncoder
 
 class TestMedicalPredictions:
     """Tests pour les prédictions médicales"""
     
-    def setup_method(self):
-        self.algo = AlgoVeriteMedical()
-        self.processor = DataProcessor()
-    
-    def test_different_pathologies(self):
+    def test_different_pathologies(self, algo):
         """Test avec différentes pathologies"""
         test_cases = [
             {
@@ -35,9 +25,10 @@ class TestMedicalPredictions:
             }
         ]
         
-        for case in test_cases:
-            result = self.algo.analyser_patient(case)
-            
+        # Une seule passe groupée pour tous les cas
+        analyses = algo.analyser_cohorte(test_cases)['analyses_detaillees']
+        
+        for result in analyses:
             # Vérifications de base
             assert 'patient_id' in result
             assert 'prediction_retablissement' in result
@@ -49,7 +40,7 @@ class TestMedicalPredictions:
             assert 0 <= predictions['probabilite_succes'] <= 1
             assert 0 <= predictions['niveau_confiance'] <= 1
     
-    def test_age_impact(self):
+    def test_age_impact(self, algo):
         """Test de l'impact de l'âge sur les prédictions"""
         young_patient = {
             'pathologie': 'GRIPPE',
@@ -63,8 +54,8 @@ class TestMedicalPredictions:
             'profil': {'age': 70, 'comorbidities': 0}
         }
         
-        young_result = self.algo.analyser_patient(young_patient)
-        senior_result = self.algo.analyser_patient(senior_patient)
+        young_result = algo.analyser_patient(young_patient)
+        senior_result = algo.analyser_patient(senior_patient)
         
         # Le patient âgé devrait avoir une durée de maladie plus longue
         young_duration = young_result['prediction_retablissement']['duree_maladie_predite']
@@ -72,7 +63,7 @@ class TestMedicalPredictions:
         
         assert senior_duration >= young_duration
     
-    def test_comorbidities_impact(self):
+    def test_comorbidities_impact(self, algo):
         """Test de l'impact des comorbidités"""
         healthy_patient = {
             'pathologie': 'GRIPPE',
@@ -86,8 +77,8 @@ class TestMedicalPredictions:
             'profil': {'age': 40, 'comorbidities': 3}
         }
         
-        healthy_result = self.algo.analyser_patient(healthy_patient)
-        comorbid_result = self.algo.analyser_patient(comorbid_patient)
+        healthy_result = algo.analyser_patient(healthy_patient)
+        comorbid_result = algo.analyser_patient(comorbid_patient)
         
         # Le patient avec comorbidités devrait avoir une probabilité de succès plus faible
         healthy_prob = healthy_result['prediction_retablissement']['probabilite_succes']
@@ -95,7 +86,7 @@ class TestMedicalPredictions:
         
         assert comorbid_prob <= healthy_prob
     
-    def test_symptom_severity_impact(self):
+    def test_symptom_severity_impact(self, algo):
         """Test de l'impact de la sévérité des symptômes"""
         mild_case = {
             'pathologie': 'GRIPPE',
@@ -109,8 +100,8 @@ class TestMedicalPredictions:
             'profil': {'age': 35, 'comorbidities': 0}
         }
         
-        mild_result = self.algo.analyser_patient(mild_case)
-        severe_result = self.algo.analyser_patient(severe_case)
+        mild_result = algo.analyser_patient(mild_case)
+        severe_result = algo.analyser_patient(severe_case)
         
         # Le cas sévère devrait avoir un score de gravité plus élevé
         mild_gravity = mild_result['condition_actuelle']['score_gravite']
@@ -118,7 +109,7 @@ class TestMedicalPredictions:
         
         assert severe_gravity > mild_gravity
     
-    def test_treatment_relevance(self):
+    def test_treatment_relevance(self, algo):
         """Test de la pertinence des traitements recommandés"""
         covid_patient = {
             'pathologie': 'COVID',
@@ -126,7 +117,7 @@ class TestMedicalPredictions:
             'profil': {'age': 45, 'comorbidities': 1}
         }
         
-        result = self.algo.analyser_patient(covid_patient)
+        result = algo.analyser_patient(covid_patient)
         treatments = result['traitements_recommandes']
         
         # Vérifier qu'au moins un traitement est recommandé
@@ -139,7 +130,7 @@ class TestMedicalPredictions:
             assert 'protocole' in treatment
             assert 0 <= treatment['score_global'] <= 1
     
-    def test_cohort_analysis(self):
+    def test_cohort_analysis(self, algo):
         """Test de l'analyse de cohorte"""
         patients = [
             {
@@ -154,7 +145,7 @@ class TestMedicalPredictions:
             }
         ]
         
-        result = self.algo.analyser_cohorte(patients)
+        result = algo.analyser_cohorte(patients)
         
         assert 'cohorte_analyse' in result
         assert 'analyses_detaillees' in result
@@ -167,10 +158,7 @@ class TestMedicalPredictions:
 class TestDataProcessing:
     """Tests pour le traitement des données"""
     
-    def setup_method(self):
-        self.processor = DataProcessor()
-    
-    def test_patient_data_processing(self):
+    def test_patient_data_processing(self, processor):
         """Test du traitement des données patient"""
         raw_data = {
             'pathologie': 'GRIPPE',
@@ -182,7 +170,7 @@ class TestDataProcessing:
             }
         }
         
-        processed = self.processor.process_patient_data(raw_data)
+        processed = processor.process_patient_data(raw_data)
         
         assert 'demographics' in processed
         assert 'medical_info' in processed
@@ -194,7 +182,7 @@ class TestDataProcessing:
         assert demographics['age'] == 35
         assert demographics['age_group'] == 'ADULTE'
     
-    def test_risk_assessment(self):
+    def test_risk_assessment(self, processor):
         """Test de l'évaluation des risques"""
         high_risk_patient = {
             'pathologie': 'COVID',
@@ -206,14 +194,31 @@ class TestDataProcessing:
             }
         }
         
-        processed = self.processor.process_patient_data(high_risk_patient)
+        processed = processor.process_patient_data(high_risk_patient)
         risk_factors = processed['risk_factors']
         
         assert risk_factors['score'] > 0.5
         assert risk_factors['level'] == 'ÉLEVÉ'
         assert len(risk_factors['factors']) >= 3
     
-    def test_pyramid_data_processing(self):
+    def test_patients_batch_processing(self, processor):
+        """Test du traitement par lot, identique au traitement unitaire"""
+        patients = [
+            {'pathologie': 'COVID', 'symptomes': ['FIÈVRE_ÉLEVÉE'], 'profil': {'age': 75, 'comorbidities': 3, 'immunity_level': 0.3}},
+            {'pathologie': 'GRIPPE', 'symptomes': ['TOUX'], 'profil': {'age': 8}},
+            {'id': 'PAT_TEST', 'pathologie': 'GRIPPE', 'symptomes': []}
+        ]
+        
+        batch = processor.process_patients_batch(patients)
+        
+        assert len(batch) == 3
+        assert batch[2]['id'] == 'PAT_TEST'
+        for processed, raw_data in zip(batch, patients):
+            assert processed['risk_factors'] == processor.process_patient_data(raw_data)['risk_factors']
+        assert batch[0]['risk_factors']['level'] == 'ÉLEVÉ'
+        assert batch[1]['risk_factors']['factors'] == ["Âge pédiatrique"]
+    
+    def test_pyramid_data_processing(self, processor):
         """Test du traitement des données pyramidales"""
         pyramid_structure = {
             'base': [10, 20, 30],
@@ -221,7 +226,7 @@ class TestDataProcessing:
             'inferieure': [[10, 10], [0]]
         }
         
-        processed = self.processor.process_pyramid_data(pyramid_structure)
+        processed = processor.process_pyramid_data(pyramid_structure)
         
         assert 'base_metrics' in processed
         assert 'structural_metrics' in processed
@@ -231,6 +236,25 @@ class TestDataProcessing:
         base_metrics = processed['base_metrics']
         assert base_metrics['length'] == 3
         assert base_metrics['mean'] == 20.0
+    
+    def test_base_harmony_independent_of_length(self, processor):
+        """Test de l'harmonie de base identique sur les chemins boucle et NumPy"""
+        base = [20, 23, 27, 32, 38, 45, 54, 65, 78, 94, 113, 136, 163, 196, 235, 282, 338]
+        
+        assert processor._calculate_base_harmony(base[:15]) == 0.5
+        assert processor._calculate_base_harmony(base) == 0.5
+        assert processor._calculate_base_harmony(list(range(0, 51, 3))) == 0.9
+        # Entiers au-delà de int64 : repli sur la boucle Python
+        assert processor._calculate_base_harmony([2 ** i for i in range(80)]) == 0.8
+    
+    def test_storage_round_trip(self):
+        """Test de l'aller-retour de stockage avec NaN et grands entiers"""
+        for profil in ({'age': 30, 'comorbidities': 0}, {'immunity_level': float('nan')}, {'age': 2 ** 70}):
+            encoded = MedicalDataEncoder.encode_patient_for_storage({'pathologie': 'GRIPPE', 'profil': profil})
+            decoded = MedicalDataEncoder.decode_patient_from_storage(encoded)
+            
+            assert decoded['pathologie'] == 'GRIPPE'
+            assert repr(decoded['profile']) == repr(profil)
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
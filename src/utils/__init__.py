@@ -6,10 +6,15 @@ from src.utils.config import get_settings, Settings
 from src.utils.logger import setup_logging, get_logger
 from src.utils.helpers import (
     generate_hash,
+    generate_hash_fast,
+    generate_hash_bytes,
+    hash_many,
     safe_divide,
     normalize_value,
+    normalize_array,
     timestamp,
-    deep_merge
+    deep_merge,
+    deep_merge_view
 )
 
 __all__ = [
@@ -18,8 +23,13 @@ __all__ = [
     "setup_logging",
     "get_logger",
     "generate_hash",
+    "generate_hash_fast",
+    "generate_hash_bytes",
+    "hash_many",
     "safe_divide",
     "normalize_value",
+    "normalize_array",
     "timestamp",
-    "deep_merge"
+    "deep_merge",
+    "deep_merge_view"
 ]
\ No newline at end of file
@@ -1,4 +1,5 @@
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 class Settings(BaseSettings):
@@ -28,10 +29,10 @@ class Settings(BaseSettings):
     OPENFDA_API_KEY: Optional[str] = None
     ELASTICSEARCH_URL: Optional[str] = None
     
-    class Config:
-        env_file = ".env"
-        extra = "ignore"  # Ignorer les variables supplémentaires
+    # Ignorer les variables supplémentaires ; instance figée, partagée via get_settings()
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Retourne la configuration de l'application"""
+    """Retourne la configuration de l'application (lue et validée une seule fois par processus)"""
     return Settings()
\ No newline at end of file
@@ -1,11 +1,51 @@
 import hashlib
-from typing import Any, Dict, List
-from datetime import datetime
+import itertools
+import math
+import numbers
+import os
+import time
+from collections import ChainMap
+from typing import Any, Dict, Iterable, List, Mapping, Union
 import numpy as np
 
-def generate_hash(data: str) -> str:
-    """Génère un hash SHA-256 d'une chaîne de données"""
-    return hashlib.sha256(data.encode()).hexdigest()
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Contexte SHA-256 vierge, jamais mis à jour : copié à chaque hash (copie sûre entre threads)
+_SHA256_VIERGE = hashlib.sha256()
+
+def generate_hash(data: Union[str, bytes]) -> str:
+    """Génère un hash SHA-256 d'une chaîne de données (les bytes sont hachés sans réencodage)"""
+    hasher = _SHA256_VIERGE.copy()
+    hasher.update(data.encode() if isinstance(data, str) else data)
+    return hasher.hexdigest()
+
+def generate_hash_bytes(data: Union[str, bytes]) -> bytes:
+    """Empreinte SHA-256 brute (32 octets), plus compacte qu'un hexdigest pour les clés de cache"""
+    hasher = _SHA256_VIERGE.copy()
+    hasher.update(data.encode() if isinstance(data, str) else data)
+    return hasher.digest()
+
+def generate_hash_fast(data: str) -> str:
+    """
+    Hash rapide de 128 bits (BLAKE3 si disponible, sinon BLAKE2b) pour les clés de cache.
+    La valeur dépend de la bibliothèque installée : ne pas la persister ni l'utiliser
+    pour une vérification d'intégrité (utiliser generate_hash).
+    """
+    if blake3 is not None:
+        return blake3.blake3(data.encode()).hexdigest(16)
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+def hash_many(items: Iterable[str]) -> List[str]:
+    """Génère les hash SHA-256 d'un lot de chaînes en une seule passe"""
+    hashes = []
+    for item in items:
+        hasher = _SHA256_VIERGE.copy()
+        hasher.update(item.encode())
+        hashes.append(hasher.hexdigest())
+    return hashes
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """Division sécurisée avec valeur par défaut si dénominateur nul"""
@@ -19,21 +59,68 @@ def normalize_value(value: float, min_val: float, max_val: float) -> float:
         return 0.5
     return (value - min_val) / (max_val - min_val)
 
+def normalize_array(values: Any, min_val: float, max_val: float, dtype: Any = np.float64) -> np.ndarray:
+    """Normalise un tableau de valeurs entre 0 et 1 en une seule opération vectorisée"""
+    values = np.asarray(values, dtype=dtype)
+    if max_val == min_val:
+        return np.full_like(values, 0.5)
+    return (values - min_val) / (max_val - min_val)
+
+# (seconde, partie date/heure formatée) du dernier timestamp, remplacé d'un bloc (sûr entre threads)
+_cache_timestamp = (None, "")
+
 def timestamp() -> str:
-    """Retourne un timestamp formaté"""
-    return datetime.now().isoformat()
+    """Retourne un timestamp formaté (même format que datetime.now().isoformat())"""
+    global _cache_timestamp
+    seconde, reste = divmod(time.time_ns(), 1_000_000_000)
+    seconde_cache, prefixe = _cache_timestamp
+    if seconde != seconde_cache:
+        prefixe = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconde))
+        _cache_timestamp = (seconde, prefixe)
+    microsecondes = reste // 1000
+    return f"{prefixe}.{microsecondes:06d}" if microsecondes else prefixe
 
 def deep_merge(dict1: Dict, dict2: Dict) -> Dict:
-    """Fusion récursive de deux dictionnaires"""
+    """Fusion récursive de deux dictionnaires (parcours itératif, sans récursion Python)"""
     result = dict1.copy()
-    for key, value in dict2.items():
-        if (key in result and isinstance(result[key], dict) 
-            and isinstance(value, dict)):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = value
+    if not dict2:
+        return result
+    
+    stack = [(result, dict2)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                # Seuls les sous-dictionnaires fusionnés sont copiés
+                merged = current.copy()
+                target[key] = merged
+                stack.append((merged, value))
+            else:
+                target[key] = value
     return result
 
+def deep_merge_view(dict1: Dict, dict2: Dict) -> Mapping:
+    """
+    Fusion de deux dictionnaires en lecture seule : évite la copie quand c'est possible
+    (dict1 tel quel si dict2 est vide, ChainMap si les clés sont disjointes).
+    Le résultat ne doit pas être modifié ; utiliser deep_merge pour une copie indépendante.
+    Un ChainMap n'étant pas un dict, le convertir (dict(...)) avant json.dumps.
+    """
+    if not dict2:
+        return dict1
+    
+    overlap = dict1.keys() & dict2.keys()
+    if not overlap:
+        return ChainMap(dict2, dict1)
+    
+    if not any(isinstance(dict1[key], dict) and isinstance(dict2[key], dict) for key in overlap):
+        merged = dict(dict1)
+        merged.update(dict2)
+        return merged
+    
+    return deep_merge(dict1, dict2)
+
 def calculate_percentage(part: float, total: float) -> float:
     """Calcule un pourcentage sécurisé"""
     if total == 0:
@@ -53,27 +140,84 @@ def format_duration(days: int) -> str:
         months = days // 30
         return f"{months} mois"
 
+# Bornes des unités de durée : < 7 jours, < 30 jours (semaines), au-delà (mois)
+_DURATION_BOUNDS = np.array([7, 30])
+
+def format_durations(days: Any) -> List[str]:
+    """Formate un lot de durées entières en jours (mêmes règles que format_duration)"""
+    days = np.asarray(days, dtype=np.int64)
+    units = np.searchsorted(_DURATION_BOUNDS, days, side='right')
+    counts = np.select([units == 0, units == 1], [days, days // 7], days // 30)
+    
+    durations = []
+    for count, unit in zip(counts.tolist(), units.tolist()):
+        if unit == 0:
+            durations.append("1 jour" if count == 1 else f"{count} jours")
+        elif unit == 1:
+            durations.append(f"{count} semaine{'s' if count > 1 else ''}")
+        else:
+            durations.append(f"{count} mois")
+    return durations
+
+_ERREUR_PATHOLOGIE = "La pathologie est requise"
+_ERREUR_SYMPTOMES = "Au moins un symptôme est requis"
+_ERREUR_PROFIL = "Le profil patient est requis"
+_ERREUR_AGE = "L'âge doit être un nombre positif"
+_ERREUR_COMORBIDITES = "Le nombre de comorbidités ne peut pas être négatif"
+
 def validate_patient_data(data: Dict[str, Any]) -> List[str]:
     """Valide les données d'un patient et retourne les erreurs"""
     errors = []
     
     if 'pathologie' not in data or not data['pathologie']:
-        errors.append("La pathologie est requise")
+        errors.append(_ERREUR_PATHOLOGIE)
     
     if 'symptomes' not in data or not data['symptomes']:
-        errors.append("Au moins un symptôme est requis")
+        errors.append(_ERREUR_SYMPTOMES)
     
     if 'profil' not in data:
-        errors.append("Le profil patient est requis")
+        errors.append(_ERREUR_PROFIL)
     else:
         profil = data['profil']
         if 'age' not in profil or profil['age'] <= 0:
-            errors.append("L'âge doit être un nombre positif")
+            errors.append(_ERREUR_AGE)
         if 'comorbidities' not in profil or profil['comorbidities'] < 0:
-            errors.append("Le nombre de comorbidités ne peut pas être négatif")
+            errors.append(_ERREUR_COMORBIDITES)
     
     return errors
 
+def _numeric_field(profil: Dict[str, Any], key: str) -> float:
+    """Valeur numérique d'un champ du profil, NaN si absent ou non numérique"""
+    value = profil.get(key)
+    return value if isinstance(value, numbers.Real) else math.nan
+
+def validate_patient_batch(patients: List[Dict[str, Any]]) -> List[List[str]]:
+    """Valide un lot de patients avec des masques NumPy et retourne les erreurs de chacun"""
+    n = len(patients)
+    profils = [data['profil'] if 'profil' in data else {} for data in patients]
+    
+    missing_pathology = np.fromiter((not data.get('pathologie') for data in patients), dtype=bool, count=n)
+    missing_symptoms = np.fromiter((not data.get('symptomes') for data in patients), dtype=bool, count=n)
+    has_profile = np.fromiter(('profil' in data for data in patients), dtype=bool, count=n)
+    # Champs absents ou non numériques -> NaN, signalé invalide (validate_patient_data lève TypeError)
+    ages = np.fromiter((_numeric_field(p, 'age') for p in profils), dtype=np.float64, count=n)
+    comorbidities = np.fromiter((_numeric_field(p, 'comorbidities') for p in profils), dtype=np.float64, count=n)
+    
+    # Même ordre de contrôle que validate_patient_data
+    checks = (
+        (missing_pathology, _ERREUR_PATHOLOGIE),
+        (missing_symptoms, _ERREUR_SYMPTOMES),
+        (~has_profile, _ERREUR_PROFIL),
+        (has_profile & ~(ages > 0), _ERREUR_AGE),
+        (has_profile & ~(comorbidities >= 0), _ERREUR_COMORBIDITES)
+    )
+    
+    errors = [[] for _ in range(n)]
+    for mask, message in checks:
+        for i in np.flatnonzero(mask).tolist():
+            errors[i].append(message)
+    return errors
+
 def calculate_age_group(age: int) -> str:
     """Calcule le groupe d'âge"""
     if age < 18:
@@ -83,12 +227,37 @@ def calculate_age_group(age: int) -> str:
     else:
         return "SÉNIOR"
 
+# Seuils des groupes d'âge : < 18 ans, < 65 ans, au-delà
+_AGE_GROUP_BOUNDS = np.array([18, 65])
+_AGE_GROUP_LABELS = np.array(["PÉDIATRIQUE", "ADULTE", "SÉNIOR"])
+
+def calculate_age_groups(ages: Any) -> np.ndarray:
+    """Calcule les groupes d'âge d'un lot de patients en une seule recherche vectorisée"""
+    return _AGE_GROUP_LABELS[np.searchsorted(_AGE_GROUP_BOUNDS, np.asarray(ages, dtype=np.float64), side='right')]
+
+# Compteur propre au processus, amorcé sur l'horloge et le PID pour différer d'un processus à l'autre
+_patient_id_counter = itertools.count(((time.time_ns() // 1000) ^ os.getpid()) & 0xFFFFFF)
+
 def generate_patient_id() -> str:
-    """Génère un ID patient unique"""
-    return f"PAT_{datetime.now().strftime('%Y%m%d%H%M%S')}_{hashlib.md5(str(datetime.now().timestamp()).encode()).hexdigest()[:6]}"
+    """Génère un ID patient unique (horodatage + compteur, sans hash)"""
+    date = time.strftime('%Y%m%d%H%M%S')
+    return f"PAT_{date}_{next(_patient_id_counter) & 0xFFFFFF:06x}"
+
+# Conversions indexées par type exact pour les types NumPy les plus fréquents
+_JSON_DISPATCH = {
+    np.float64: float,
+    np.float32: float,
+    np.int64: float,
+    np.int32: float,
+    np.ndarray: np.ndarray.tolist
+}
 
 def safe_json_serialize(obj: Any) -> Any:
     """Sérialise un objet en JSON de façon sécurisée"""
+    convert = _JSON_DISPATCH.get(type(obj))
+    if convert is not None:
+        return convert(obj)
+    
     if isinstance(obj, (np.integer, np.floating)):
         return float(obj)
     elif isinstance(obj, np.ndarray):
@@ -2,13 +2,33 @@ import logging
 import sys
 from typing import Optional
 
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter qui ne reformate la date qu'une fois par seconde (datefmt sans millisecondes)"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = None
+        self._cached_time = ""
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_time = super().formatTime(record, datefmt)
+            self._cached_second = second
+        return self._cached_time
+
 def setup_logging(level: str = "INFO", log_file: Optional[str] = None):
     """Configure le système de logging"""
     
+    # Informations de thread/processus inutilisées par le format : non collectées
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     log_level = getattr(logging, level.upper(), logging.INFO)
     
     # Formatter personnalisé
-    formatter = logging.Formatter(
+    formatter = CachedTimeFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )